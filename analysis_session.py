@@ -0,0 +1,83 @@
+import os
+import threading  # The session can be used from a worker thread while the window stays responsive
+from collections import OrderedDict
+
+from idle_time_report import extract_idle_data, IDLE_SHEETS
+from item_efficiency import item_extract_efficiency, ITEM_EFFICIENCY_SHEETS
+from op_efficiency import process_data_em, process_data_op, EFFICIENCY_SHEETS
+from workbook_cache import file_content_hash
+from workbook_loader import iter_sheet_chunks, read_sheets
+
+# Frames kept in memory by a session, the least recently used are dropped first
+DEFAULT_MAX_ARTIFACTS = 16
+
+
+class AnalysisSession:
+    # Parsed sheets and derived frames of the files opened while the app runs, each computed once
+    # Every frame is keyed by its name and the fingerprint (content hash) of the file it comes from, so the idle
+    # summary and then the mean idle chart of the same export cost one extract_idle_data run, while a file saved
+    # again with other data is computed again
+    # The frames are shared between the buttons: the reports must not modify them in place
+
+    def __init__(self, workbook_cache=None, max_artifacts=DEFAULT_MAX_ARTIFACTS):
+        self.workbook_cache = workbook_cache
+        self.max_artifacts = max_artifacts
+        self.artifacts = OrderedDict()
+        self.file_hashes = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, file_path):
+        # Content hash of the file, hashed again only when its size or modification time changed
+        stat = os.stat(file_path)
+        stamp = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if stamp not in self.file_hashes:
+            self.file_hashes[stamp] = file_content_hash(file_path)
+        return self.file_hashes[stamp]
+
+    def artifact(self, name, file_path, compute):
+        # Return the frame `name` of the file, computing it with compute() the first time
+        key = (name, self.fingerprint(file_path))
+        with self.lock:
+            if key in self.artifacts:
+                self.artifacts.move_to_end(key)
+                self.hits += 1
+                return self.artifacts[key]
+        # Computed outside the lock; a failed computation raises and nothing is stored
+        value = compute()
+        with self.lock:
+            self.misses += 1
+            self.artifacts[key] = value
+            while len(self.artifacts) > self.max_artifacts:
+                self.artifacts.popitem(last=False)
+        return value
+
+    def sheets(self, file_path, sheets):
+        # read_sheets, through the WorkbookCache on disk and then kept in memory
+        return self.artifact(('sheets', repr(sheets)), file_path,
+                             lambda: read_sheets(file_path, sheets, self.workbook_cache,
+                                                 content_hash=self.fingerprint(file_path)))
+
+    def idle_data(self, file_path):
+        # extract_idle_data of a Time Management export, streamed in chunks (see workbook_loader.iter_sheet_chunks)
+        return self.artifact('idle_data', file_path,
+                             lambda: extract_idle_data(iter_sheet_chunks(file_path, 0, *IDLE_SHEETS[0])))
+
+    def item_efficiency(self, file_path):
+        # item_extract_efficiency of the 'Operations' sheet of a Job Costs export
+        return self.artifact('item_efficiency', file_path, lambda: item_extract_efficiency(
+            self.sheets(file_path, ITEM_EFFICIENCY_SHEETS)['Operations']))
+
+    def employee_efficiency(self, file_path):
+        # process_data_em of the 'Operator Time' sheet of a Job Costs export
+        return self.artifact('employee_efficiency', file_path, lambda: process_data_em(
+            self.sheets(file_path, EFFICIENCY_SHEETS)['Operator Time']))
+
+    def operation_efficiency(self, file_path):
+        # process_data_op of the 'Operations' sheet of a Job Costs export
+        return self.artifact('operation_efficiency', file_path, lambda: process_data_op(
+            self.sheets(file_path, EFFICIENCY_SHEETS)['Operations']))
+
+    def report(self):
+        return f"Analysis session: {self.hits} hits, {self.misses} computed, {len(self.artifacts)} frames kept"
@@ -0,0 +1,80 @@
+import json  # Used to store the API responses as text
+import os
+import sqlite3  # Local database that holds the cached responses
+import time  # Used to check how old a cached response is
+
+# Folder where EffiView keeps its caches (in the user folder so it survives the one-file executable)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.effiview')
+DEFAULT_API_CACHE_PATH = os.path.join(CACHE_DIR, 'fulcrum_api.sqlite')
+
+# Cached responses older than this (in seconds) are always checked again with the API
+DEFAULT_TTL = 12 * 60 * 60
+
+
+class ApiCache:
+    # Persistent cache of raw Fulcrum API responses (jobs, sales orders and operation lists)
+    # Each response is stored with its ETag and a version key (e.g. the job's modified timestamp),
+    # so the next run only downloads again what changed
+
+    def __init__(self, path=DEFAULT_API_CACHE_PATH, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        # WAL keeps the writes cheap, they are only committed when the cache is closed
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, version TEXT, fetched_at REAL NOT NULL)'
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def get(self, key):
+        # Return the cached entry as a dict, or None when the key was never stored
+        row = self.connection.execute(
+            'SELECT body, etag, version, fetched_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, version, fetched_at = row
+        return {'data': json.loads(body), 'etag': etag, 'version': version, 'fetched_at': fetched_at}
+
+    def is_fresh(self, entry, version=None):
+        # An entry can be used without asking the API only when the caller knows the current version of the record
+        # (e.g. the job's modified timestamp from the job list), it was stored for that version and is younger than
+        # the TTL. Without a version (sales orders, or a job list that sends no modified timestamp) the API is always
+        # asked, with the stored ETag, so a changed record is never served from the cache
+        if entry is None or version is None or time.time() - entry['fetched_at'] > self.ttl:
+            return False
+        return entry['version'] == str(version)
+
+    def put(self, key, data, etag=None, version=None):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses (key, body, etag, version, fetched_at) VALUES (?, ?, ?, ?, ?)',
+            (key, json.dumps(data), etag, None if version is None else str(version), time.time())
+        )
+
+    def touch(self, key, version=None):
+        # The API confirmed (304 Not Modified) that the cached entry is still current
+        self.connection.execute(
+            'UPDATE responses SET fetched_at = ?, version = COALESCE(?, version) WHERE key = ?',
+            (time.time(), None if version is None else str(version), key)
+        )
+
+    def report(self):
+        return f"API cache: {self.hits} hits, {self.revalidated} revalidated, {self.misses} misses"
@@ -0,0 +1,982 @@
+import argparse  # Used to pick which benchmark to run from the terminal
+import contextlib  # Used to silence the per-job prints while timing
+import datetime
+import io
+import os
+import tempfile
+import time  # Used to time each benchmark
+import tracemalloc  # Used to measure peak memory
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests  # Used by the old thread-pool path
+
+import numpy as np
+import pandas as pd
+
+from fulcrum_stub_server import make_job, make_operations, make_sales_order, start_stub_server
+from fulcrum_stub_server import OPERATION_NAMES, OPERATION_STATUSES
+from gantt_chart import (API_DATETIME_FORMATS, JOB_FILL_COLUMNS, ApiFrameBuilder, add_status_styles,
+                         build_gantt_figure, extract_data_from_api, extract_job_data, extract_operation_columns,
+                         fill_job_columns, process_df, select_gantt_jobs, start_api_pull, to_gantt_datetime)
+from stage_timer import StageTimer
+import workbook_loader
+from workbook_cache import WorkbookCache
+from item_efficiency import ITEM_EFFICIENCY_SHEETS, REQUIRED_COLUMNS, REQUIRED_COLUMN_DTYPES, item_extract_efficiency
+from op_efficiency import EFFICIENCY_SHEETS
+from idle_time_report import (DAY_SHIFT, NIGHT_SHIFT, IDLE_SHEETS, add_idle_columns, extract_idle_data,
+                              filter_idle_rows, mark_overtime)
+from analysis_session import AnalysisSession
+from category_summary import dominant_category
+from clock_intervals import sweep_clock_intervals
+
+
+def thread_pool_fetch(base_url, job_ids, max_workers=50):
+    # The previous extract_data_from_api path: a new requests connection per call, fanned out over 50 threads
+    headers = {'Authorization': 'Bearer authorization key here', 'Content-Type': 'application/json'}
+
+    def fetch_data(jobId):
+        job_data = requests.get(f"{base_url}/jobs/{jobId}", headers=headers).json()
+        requests.get(f"{base_url}/sales-orders/{job_data['salesOrderId']}", headers=headers).json()
+        return requests.post(f"{base_url}/jobs/{jobId}/operations/list", headers=headers).json()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_data, jobId) for jobId in job_ids]
+        return [future.result() for future in as_completed(futures)]
+
+
+def benchmark_api_client(job_count=500, latency=0.02, max_concurrency=50):
+    # Compare requests per second of the thread-pool path and the pooled async client against the stub server
+    server = start_stub_server(job_count=job_count, latency=latency)
+    request_count = 3 * job_count  # Three calls per job (the job list pages are not counted)
+
+    try:
+        start = time.perf_counter()
+        thread_pool_fetch(server.base_url, range(1, job_count + 1))
+        thread_pool_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract_data_from_api(server.base_url, max_concurrency=max_concurrency, cache_path=None,
+                                  rate_limit=None)
+        async_seconds = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"API client benchmark: {job_count} jobs, {latency * 1000:.0f} ms latency per call")
+    print(f"  Thread pool (50 threads) : {thread_pool_seconds:.2f} s, {request_count / thread_pool_seconds:.0f} req/s")
+    print(f"  Async client ({max_concurrency} conns) : {async_seconds:.2f} s, {request_count / async_seconds:.0f} req/s")
+
+
+def benchmark_api_cache(job_count=500, latency=0.02, changed_jobs=10):
+    # Compare a cold Gantt pull with a warm refresh where only a few jobs changed since the last run
+    # The last run moves the delivery date of one sales order and pauses the operations of one job without changing
+    # the job: neither has a version of its own, so the cached copies must be revalidated and the changes must reach
+    # the frame
+    server = start_stub_server(job_count=job_count, latency=latency)
+    cache_path = os.path.join(tempfile.mkdtemp(), 'fulcrum_api.sqlite')
+    timings = {}
+
+    try:
+        runs = [('Cold (empty cache)', 0, None), ('Warm (nothing changed)', 0, None),
+                (f'Warm ({changed_jobs} jobs changed)', changed_jobs, None),
+                ('Warm (1 SO, 1 job\'s ops changed)', 0, '2025/03/31')]
+        for run, changed, delivery_due_date in runs:
+            # Give the first jobs a new modified timestamp, like jobs that moved on since the last run
+            for job_id in range(1, changed + 1):
+                server.modified[job_id] = '2024-09-02T08:00:00Z'
+            # Job 1 belongs to sales order so-0
+            if delivery_due_date is not None:
+                server.delivery_due_dates['so-0'] = delivery_due_date
+                server.operation_statuses.update({(2, step): 'Paused' for step in range(1, 6)})
+            output = io.StringIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                df = extract_data_from_api(server.base_url, cache_path=cache_path, rate_limit=None)
+            timings[run] = (time.perf_counter() - start, output.getvalue().splitlines()[-1])
+    finally:
+        server.shutdown()
+
+    due = df.loc[df['Job'] == 1, 'Delivery Due Date'].dt.tz_localize(None)
+    assert (due == pd.Timestamp(delivery_due_date)).all() and len(due), "changed sales order served from the cache"
+    statuses = df.loc[df['Job'] == 2, 'Status']
+    assert (statuses == 'Paused').all() and len(statuses), "changed operations served from the cache"
+
+    print(f"API cache benchmark: {job_count} jobs, {latency * 1000:.0f} ms latency per call")
+    for run, (seconds, report) in timings.items():
+        print(f"  {run:<32}: {seconds:.2f} s ({report})")
+
+
+def benchmark_api_scale(job_counts=(100, 1000, 10000), latency=0.005, error_rate=0.01):
+    # Throughput of extract_data_from_api from 100 to 10,000 jobs against the stand-in server, with a few 500s
+    print(f"API scale benchmark: {latency * 1000:.0f} ms latency per call, {error_rate:.0%} of calls fail")
+    for job_count in job_counts:
+        server = start_stub_server(job_count=job_count, latency=latency, error_rate=error_rate)
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = extract_data_from_api(server.base_url, cache_path=None, rate_limit=None)
+            seconds = time.perf_counter() - start
+        finally:
+            server.shutdown()
+        print(f"  {job_count:>6} jobs: {seconds:6.2f} s, {job_count / seconds:5.0f} jobs/s, {len(df)} operation rows")
+
+
+def dict_per_row_frame(responses):
+    # The previous flattening: one merged dict per operation, then pd.DataFrame(list of dicts)
+    all_data = []
+    for job, sales_order, operations_data in responses:
+        job_data = {'Job': job['name'], 'job_salesOrderId': job['salesOrderId'], 'Date Created': job['createdUtc'],
+                    'Job Est. Completion': job['scheduledEndUtc']}
+        sales_data = {'Sales Order': sales_order['number'], 'Delivery Due Date': sales_order['deliveryDueDate']}
+        for item in operations_data:
+            item_reference = item['itemToMake']['itemReference']
+            operation = item['operation']
+            item_to_make_data = {'Job Item': item_reference['number'],
+                                 'Job Item Description': item_reference['description']}
+            operation_data = {'Status': operation['status'], 'Step': operation['order'],
+                              'Actual Start': operation['scheduledStartUtc'],
+                              'Instructions': operation['instructions'],
+                              'Actual End': operation['completedOnUtc'], 'Operation': operation['name']}
+            all_data.append({**job_data, **sales_data, **item_to_make_data, **operation_data})
+    df = pd.DataFrame(all_data)
+    df['Job'] = pd.to_numeric(df['Job'], errors='coerce')
+    # Same typed dates as ApiFrameBuilder, parsed once per operation
+    for column, (format, utc) in API_DATETIME_FORMATS.items():
+        df[column] = to_gantt_datetime(df[column], format, utc)
+    return df
+
+
+def columnar_frame(responses):
+    api_frame = ApiFrameBuilder()
+    for job, sales_order, operations_data in responses:
+        api_frame.add_job(extract_job_data(job, sales_order), extract_operation_columns(operations_data))
+    return api_frame.build()
+
+
+def measure(function, *args, memory=True):
+    # Return (result, seconds, peak MB) of one call; memory=False skips tracemalloc, which slows Python code down
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def benchmark_api_frame(job_count=10000, operations_per_job=8):
+    # Time and peak memory of turning the raw API responses into the API dataframe
+    responses = [(make_job(job_id), make_sales_order(make_job(job_id)['salesOrderId']),
+                  make_operations(job_id, operations_per_job)) for job_id in range(1, job_count + 1)]
+
+    df_rows, rows_seconds, rows_peak = measure(dict_per_row_frame, responses)
+    df_columns, columns_seconds, columns_peak = measure(columnar_frame, responses)
+    pd.testing.assert_frame_equal(df_rows, df_columns)
+
+    print(f"API frame benchmark: {job_count} jobs, {len(df_columns)} operations (identical output)")
+    print(f"  Dict per operation : {rows_seconds:.2f} s, peak {rows_peak:.0f} MB")
+    print(f"  Column buffers     : {columns_seconds:.2f} s, peak {columns_peak:.0f} MB")
+
+
+def make_gantt_frame(job_count, operations_per_job=6):
+    # A frame shaped like the output of process_df, built from the stand-in dataset
+    rows = []
+    for job_id in range(1, job_count + 1):
+        job = make_job(job_id)
+        sales_order = make_sales_order(job['salesOrderId'])
+        for item in make_operations(job_id, operations_per_job):
+            operation = item['operation']
+            start = pd.Timestamp(operation['scheduledStartUtc']).tz_convert('Asia/Kuala_Lumpur')
+            end = start + pd.Timedelta(hours=6)
+            rows.append({
+                'SO/WO': f"{sales_order['number']}/WO{job_id}",
+                'Job': float(job_id),
+                'Job Status': 'In Progress',
+                'Date Created': pd.Timestamp(job['createdUtc']).tz_convert('Asia/Kuala_Lumpur'),
+                'Delivery Due Date': pd.Timestamp(sales_order['deliveryDueDate'], tz='Asia/Kuala_Lumpur'),
+                'Production Due Date': pd.Timestamp(sales_order['deliveryDueDate'], tz='Asia/Kuala_Lumpur'),
+                'Job Est. Completion': pd.Timestamp(job['scheduledEndUtc']).tz_convert('Asia/Kuala_Lumpur'),
+                'Job Item': item['itemToMake']['itemReference']['number'],
+                'Job Item Description': item['itemToMake']['itemReference']['description'],
+                'Make Item': item['itemToMake']['itemReference']['number'],
+                'Step': operation['order'],
+                'Operation': operation['name'],
+                'Status': operation['status'],
+                'Actual Start': start,
+                'Actual End': end,
+                'Scheduled Start': pd.NaT,
+                'Scheduled End': pd.NaT,
+                'Start': start,
+                'End': end,
+                'Qty': '1/1'
+            })
+    df = pd.DataFrame(rows)
+    df[['Scheduled Start', 'Scheduled End']] = df[['Scheduled Start', 'Scheduled End']].apply(to_gantt_datetime)
+    return df
+
+
+def benchmark_gantt_render(job_count=500, operations_per_job=6):
+    # Trace count, figure build time and JSON size of the per-row and the batched Gantt traces
+    df = make_gantt_frame(job_count, operations_per_job)
+    print(f"Gantt render benchmark: {len(df)} operation rows")
+    for label, batched in [('Four traces per row', False), ('Batched by color', True)]:
+        start = time.perf_counter()
+        fig = build_gantt_figure(df.copy(), batched=batched)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        size = len(fig.to_json())
+        json_seconds = time.perf_counter() - start
+        print(f"  {label:<20}: {len(fig.data):>5} traces, build {build_seconds:.2f} s, "
+              f"to_json {json_seconds:.2f} s, {size / 2 ** 20:.1f} MB")
+
+
+def benchmark_gantt_window(job_count=2000, operations_per_job=6, jobs_per_page=100):
+    # Whole shop in one figure against one page of the most urgent jobs and a two-week date window
+    df = make_gantt_frame(job_count, operations_per_job)
+    print(f"Gantt window benchmark: {job_count} jobs, {len(df)} operation rows "
+          f"(job bars drawn once per job, not once per operation row)")
+    views = [('All jobs', {}),
+             (f'Page of {jobs_per_page} jobs', {'jobs_per_page': jobs_per_page}),
+             ('Two-week window', {'window_start': '2024-09-01', 'window_end': '2024-09-15'})]
+    for label, window in views:
+        start = time.perf_counter()
+        df_view, page_count = select_gantt_jobs(df, **window)
+        fig = build_gantt_figure(df_view.copy())
+        build_seconds = time.perf_counter() - start
+        bars = sum(len(trace.y) for trace in fig.data if trace.type == 'bar')
+        size = len(fig.to_json())
+        print(f"  {label:<18}: {df_view['SO/WO'].nunique():>5} jobs, {bars:>5} bars, {page_count:>3} pages, "
+              f"build {build_seconds:.2f} s, {size / 2 ** 20:.1f} MB")
+
+
+def write_gantt_workbook(path, job_count, operations_per_job=20):
+    # An Excel export shaped like the one the Gantt button reads ('Latest Job Activity' and 'Open Operations'),
+    # for the same jobs as the stand-in server
+    jobs = [f"WO{job_id}" for job_id in range(1, job_count + 1)]
+    created = pd.Timestamp('2024-08-01')
+    df_job = pd.DataFrame({
+        'Job': jobs, 'Job Item': 'ITEM', 'Customer': 'Customer', 'Current Item': 'ITEM', 'Activity Date': created,
+        'User': 'user', 'Operation': 'Turning', 'Latest Activity': 'Clock in', 'Job Est. Completion': created,
+        'Production Due Date': created, 'Job Item Description': 'Mandrel body', 'Planned Quantity': 10,
+        'Quantity Completed': 0, 'Sales Order': [f"SO{job_id // 3}" for job_id in range(1, job_count + 1)],
+        'Customer PO': 'PO', 'Current Item Description': 'Mandrel body', 'Log Type': 'Labor',
+        'Status': 'In Progress', 'Date Created': created, 'Delivery Due Date': created + pd.Timedelta(days=60),
+        'Make Item': 'ITEM'})
+    rows = job_count * operations_per_job
+    steps = np.tile(np.arange(1, operations_per_job + 1), job_count)
+    scheduled = created + pd.to_timedelta(steps, unit='D')
+    df_op = pd.DataFrame({
+        'Job': np.repeat(jobs, operations_per_job), 'Step': steps, 'Operation': 'Turning', 'Status': 'Ready',
+        'Sales Order': np.repeat(df_job['Sales Order'], operations_per_job).to_numpy(),
+        'Scheduled Start': scheduled, 'Scheduled End': scheduled + pd.Timedelta(hours=6), 'Customer PO': 'PO',
+        'Planned Setup Hours': 1.0, 'Actual Setup Hours': 1.0, 'Planned Labor Hours': 2.0, 'Actual Labor Hours': 2.0,
+        'Planned Machine Hours': 2.0, 'Actual Machine Hours': 2.0, 'Ready To Collect From Previous Operation': 1,
+        'Quantity Collected From Previous Operation': 1, 'Scheduled Department': 'Machining',
+        'Scheduled Equipment': 'Lathe', 'Scheduled Work Center': 'Lathes', 'Job Item': 'ITEM',
+        'Job Item Description': 'Mandrel body', 'Quantity Completed': np.nan, 'Customer': 'Customer',
+        'Production Due Date': created + pd.Timedelta(days=50), 'Planned Quantity': 10}, index=range(rows))
+    with pd.ExcelWriter(path) as writer:
+        df_job.to_excel(writer, sheet_name='Latest Job Activity', index=False)
+        df_op.to_excel(writer, sheet_name='Open Operations', index=False)
+
+
+def benchmark_gantt_pipeline(job_count=500, latency=0.02, operations_per_job=20):
+    # Button press to merged Gantt frame: API pull then Excel read (serial) against the API pull in the
+    # background while the workbook is read (overlapped)
+    path = os.path.join(tempfile.mkdtemp(), 'gantt.xlsx')
+    write_gantt_workbook(path, job_count, operations_per_job)
+    server = start_stub_server(job_count=job_count, latency=latency)
+    api_options = {'base_url': server.base_url, 'cache_path': None, 'rate_limit': None}
+    timings = {}
+
+    try:
+        for label, overlapped in [('Serial', False), ('Overlapped', True)]:
+            timer = StageTimer()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if overlapped:
+                    df_api = start_api_pull(timer, **api_options)
+                else:
+                    with timer.stage('API pull'):
+                        df_api = extract_data_from_api(**api_options)
+                with timer.stage('Read Excel'):
+                    df_job = pd.read_excel(path, sheet_name='Latest Job Activity')
+                    df_op = pd.read_excel(path, sheet_name='Open Operations')
+                process_df(df_job, df_op, df_api, timer)
+            timings[label] = timer.report()
+    finally:
+        server.shutdown()
+
+    print(f"Gantt pipeline benchmark: {job_count} jobs from the API ({latency * 1000:.0f} ms latency per call), "
+          f"{job_count * operations_per_job} Excel operation rows")
+    for label, report in timings.items():
+        print(f"  {label}")
+        print('\n'.join(f"  {line}" for line in report.splitlines()[1:]))
+
+
+def write_job_costs_workbook(path, rows, seed=0):
+    # A Job Costs export with an 'Operations' sheet of `rows` rows and an 'Operator Time' sheet of a quarter of
+    # that, each with about 25 columns like the real export (most of them unused by the reports)
+    rng = np.random.default_rng(seed)
+    jobs = np.array([f"WO{job}" for job in range(rows // 8 + 1)], dtype=object)
+    operations = np.array(OPERATION_NAMES, dtype=object)
+    extra_columns = {f"Cost Field {number}": rng.random(rows) * 100 for number in range(12)}
+    extra_columns.update({f"Note {number}": rng.choice(['', 'Rework', 'Urgent', 'Customer supplied'], rows)
+                          for number in range(4)})
+    df_operations = pd.DataFrame({
+        'Job': jobs[np.arange(rows) // 8], 'Make Item': rng.choice(['ITEM-1', 'ITEM-2', 'ITEM-3'], rows),
+        'Make Item Description': rng.choice(['Mandrel body', 'Tieback extension', 'Crossover sub'], rows),
+        'Operation': operations[rng.integers(0, len(operations), rows)],
+        'Estimated Total Hours': rng.random(rows) * 10, 'Actual Total Hours': rng.random(rows) * 10,
+        'Total Hours Variance': rng.normal(0, 2, rows), 'Estimated Make Quantity': rng.integers(1, 20, rows),
+        'Job Completed On': pd.Timestamp('2024-09-01') + pd.to_timedelta(rng.integers(0, 30, rows), unit='D'),
+        **extra_columns})
+    operator_rows = rows // 4
+    df_operator = pd.DataFrame({
+        'Job': jobs[np.arange(operator_rows) // 2], 'Item': 'ITEM-1', 'Description': 'Mandrel body',
+        'Employee': rng.choice([' Operator A', 'Operator B ', 'Operator C'], operator_rows),
+        'Operation': operations[rng.integers(0, len(operations), operator_rows)],
+        'Planned Hours': rng.random(operator_rows) * 8, 'Total Clocked Hours': rng.random(operator_rows) * 8,
+        **{column: values[:operator_rows] for column, values in extra_columns.items()}})
+    with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
+        df_operator.to_excel(writer, sheet_name='Operator Time', index=False)
+        df_operations.to_excel(writer, sheet_name='Operations', index=False)
+
+
+def benchmark_workbook_load(rows=200_000):
+    # The Job Costs buttons: one pd.read_excel per sheet with every column (openpyxl), against read_sheets (one open,
+    # only the declared columns, dtypes while reading, calamine)
+    path = os.path.join(tempfile.mkdtemp(), 'job_costs.xlsx')
+    write_job_costs_workbook(path, rows)
+    sheets = {**EFFICIENCY_SHEETS}
+    sheets['Operations'] = (list(dict.fromkeys(EFFICIENCY_SHEETS['Operations'][0] + REQUIRED_COLUMNS)),
+                            {**EFFICIENCY_SHEETS['Operations'][1], **REQUIRED_COLUMN_DTYPES})
+
+    def read_every_column():
+        return {sheet: pd.read_excel(path, sheet_name=sheet) for sheet in sheets}
+
+    df_full, full_seconds, _ = measure(read_every_column, memory=False)
+    df_projected, projected_seconds, _ = measure(workbook_loader.read_sheets, path, sheets, memory=False)
+    for sheet, (columns, dtypes) in sheets.items():
+        pd.testing.assert_frame_equal(df_projected[sheet][columns], df_full[sheet][columns].astype(dtypes))
+
+    print(f"Workbook load benchmark: Job Costs export with {rows} operation rows and {rows // 4} operator rows "
+          f"(same values in the columns the reports use)")
+    print(f"  read_excel per sheet, every column : {full_seconds:6.2f} s")
+    print(f"  read_sheets (calamine), projected  : {projected_seconds:6.2f} s")
+
+
+def benchmark_workbook_cache(rows=100_000):
+    # Opening the same Job Costs export again: parse from the workbook (cold) against the cached Arrow sheets
+    # (warm), then the same workbook saved with different data, which must be parsed again
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'job_costs.xlsx')
+    write_job_costs_workbook(path, rows)
+    cache = WorkbookCache(os.path.join(directory, 'cache'))
+    timings = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_cold, cold_seconds, _ = measure(workbook_loader.read_sheets, path, EFFICIENCY_SHEETS, cache, memory=False)
+        df_warm, warm_seconds, _ = measure(workbook_loader.read_sheets, path, EFFICIENCY_SHEETS, cache, memory=False)
+    for sheet in EFFICIENCY_SHEETS:
+        pd.testing.assert_frame_equal(df_cold[sheet], df_warm[sheet])
+    timings += [('Cold (parse + store)', cold_seconds), ('Warm (cached sheets)', warm_seconds)]
+
+    # Same file name, other content: the content hash changes, so the cached sheets are not used
+    write_job_costs_workbook(path, rows, seed=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_changed, changed_seconds, _ = measure(workbook_loader.read_sheets, path, EFFICIENCY_SHEETS, cache,
+                                                 memory=False)
+    assert not df_changed['Operations'].equals(df_cold['Operations'])
+    timings.append(('Changed workbook', changed_seconds))
+
+    # A cache bounded to about one workbook keeps the sheets used last
+    cache.max_bytes = sum(entry.stat().st_size for entry in os.scandir(cache.directory)) // 2
+    cache.evict()
+
+    print(f"Workbook cache benchmark: Job Costs export with {rows} operation rows "
+          f"({workbook_loader.EXCEL_ENGINE} reader)")
+    for label, seconds in timings:
+        print(f"  {label:<22}: {seconds:6.3f} s")
+    print(f"  {cache.report()}")
+
+
+def make_time_management_frame(rows, members=60, seed=0, days=120):
+    # A Time Management export: clock-ins and job clockings of day and night shift members over a few months,
+    # with the odd faulty time, a few excluded names and some unused columns
+    rng = np.random.default_rng(seed)
+    names = np.array([f"TEAM MEMBER {number}" for number in range(members)] + ['Sujith Pillai', 'SANTOSH KUMAR'],
+                     dtype=object)
+    member = rng.integers(0, len(names), rows)
+    day = pd.Timestamp('2024-06-03') + pd.to_timedelta(rng.integers(0, days, rows), unit='D')
+    night_shift = member % 4 == 0
+    start_minutes = np.where(night_shift, 19 * 60 + 45, 7 * 60 + 45) + rng.integers(0, 11 * 60, rows)
+    duration_hours = np.round(rng.exponential(1.5, rows), 2)
+    stop_minutes = start_minutes + (duration_hours * 60).astype(int)
+    start = day + pd.to_timedelta(start_minutes, unit='m')
+    stop = day + pd.to_timedelta(stop_minutes, unit='m')
+    started_time = pd.Series(start.strftime('%I:%M:%S %p'), dtype=object)
+    started_time[rng.random(rows) < 0.002] = 'not a time'
+    return pd.DataFrame({
+        'Job': [f"WO{job}" for job in rng.integers(1, 4000, rows)],
+        'Operation': pd.Series(rng.choice(OPERATION_NAMES, rows), dtype=object).mask(rng.random(rows) < 0.01),
+        'Team Member': names[member],
+        'Clock Type': np.where(rng.random(rows) < 0.1, 'ClockIn', 'Job'),
+        'Started On Date': start.normalize(),
+        'Started On Time': started_time,
+        'Started On Week': start.isocalendar().week.to_numpy(),
+        'Stopped On Date': stop.normalize(),
+        'Stopped On Time': stop.strftime('%I:%M:%S %p'),
+        'Labor Hours': duration_hours,
+        'Duration Hours': duration_hours,
+        'Work Center': rng.choice(['Lathes', 'Mills', 'Coating'], rows),
+        'Notes': rng.choice(['', 'Rework', 'Waiting for material'], rows),
+    })
+
+
+
+def write_time_management_workbook(path, rows, seed=0):
+    with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
+        make_time_management_frame(rows, seed=seed).to_excel(writer, index=False)
+
+
+def filtered_idle_rows(chunks):
+    # The row filters of extract_idle_data over every chunk: the part whose memory grows with the export
+    kept_rows = []
+    day_hours = None
+    warnings = set()
+    date_formats = {}
+    for chunk in chunks:
+        rows, chunk_day_hours = filter_idle_rows(chunk, warnings, date_formats)
+        kept_rows.append(rows)
+        day_hours = chunk_day_hours if day_hours is None else day_hours.add(chunk_day_hours, fill_value=0)
+    return pd.concat(kept_rows, ignore_index=True), day_hours
+
+
+def benchmark_idle_stream(rows=100_000, chunk_size=10_000, report_rows=10_000):
+    # The idle time buttons: the whole Time Management export read with pd.read_excel (every column, one frame)
+    # against iter_sheet_chunks (openpyxl read-only, the idle columns only, chunk_size rows at a time)
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'time_management.xlsx')
+    write_time_management_workbook(path, rows)
+    columns, dtypes = IDLE_SHEETS[0]
+
+    def whole_file():
+        return filtered_idle_rows([pd.read_excel(path)])
+
+    def chunked():
+        return filtered_idle_rows(workbook_loader.iter_sheet_chunks(path, 0, columns, dtypes, chunk_size))
+
+    (whole_rows, whole_hours), whole_seconds, whole_peak = measure(whole_file)
+    (chunk_rows, chunk_hours), chunk_seconds, chunk_peak = measure(chunked)
+    pd.testing.assert_frame_equal(whole_rows, chunk_rows)
+    pd.testing.assert_series_equal(whole_hours.sort_index(), chunk_hours.sort_index())
+
+    # The whole report from chunks matches the report from one frame (members and days spanning two chunks)
+    report_path = os.path.join(directory, 'time_management_report.xlsx')
+    write_time_management_workbook(report_path, report_rows, seed=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_whole = extract_idle_data(pd.read_excel(report_path))
+        df_chunked = extract_idle_data(workbook_loader.iter_sheet_chunks(report_path, 0, columns, dtypes,
+                                                                         report_rows // 7))
+    order = ['Team Member', 'Started On Date', 'Job', 'Operation', 'Duration Hours']
+    pd.testing.assert_frame_equal(df_whole.sort_values(order, kind='stable').reset_index(drop=True),
+                                  df_chunked.sort_values(order, kind='stable').reset_index(drop=True))
+
+    print(f"Idle stream benchmark: Time Management export with {rows} rows, {len(whole_rows)} kept "
+          f"(same rows and per day hours)")
+    print(f"  read_excel, whole export : {whole_seconds:6.2f} s, peak {whole_peak:7.1f} MB")
+    print(f"  iter_sheet_chunks ({chunk_size}) : {chunk_seconds:6.2f} s, peak {chunk_peak:7.1f} MB")
+    print(f"  Report of {report_rows} rows from {report_rows // 7}-row chunks matches the one-frame report")
+
+
+def benchmark_session(idle_rows=10_000, job_cost_rows=50_000):
+    # Every report button on the same two files (the Time Management export for the idle summary and mean chart,
+    # the Job Costs export for the item chart, item summary and efficiency charts): each button running its own
+    # pipeline, against one AnalysisSession computing each frame once
+    directory = tempfile.mkdtemp()
+    idle_path = os.path.join(directory, 'time_management.xlsx')
+    job_costs_path = os.path.join(directory, 'job_costs.xlsx')
+    write_time_management_workbook(idle_path, idle_rows)
+    write_job_costs_workbook(job_costs_path, job_cost_rows)
+    cache = WorkbookCache(os.path.join(directory, 'cache'))
+
+    def every_button_alone():
+        frames = []
+        for _ in range(2):
+            frames.append(extract_idle_data(workbook_loader.iter_sheet_chunks(idle_path, 0, *IDLE_SHEETS[0])))
+            frames.append(item_extract_efficiency(
+                workbook_loader.read_sheets(job_costs_path, ITEM_EFFICIENCY_SHEETS, cache)['Operations']))
+        return frames
+
+    def every_button_in_session():
+        session = AnalysisSession(cache)
+        frames = []
+        for _ in range(2):
+            frames += [session.idle_data(idle_path), session.item_efficiency(job_costs_path)]
+        return frames, session
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        alone, alone_seconds, _ = measure(every_button_alone, memory=False)
+        (shared, session), shared_seconds, _ = measure(every_button_in_session, memory=False)
+    for df_alone, df_shared in zip(alone, shared):
+        pd.testing.assert_frame_equal(df_alone, df_shared)
+
+    print(f"Session benchmark: idle summary + mean chart of a {idle_rows}-row Time Management export, "
+          f"item chart + summary of a {job_cost_rows}-row Job Costs export")
+    print(f"  Each button alone : {alone_seconds:6.2f} s")
+    print(f"  AnalysisSession   : {shared_seconds:6.2f} s ({session.report()})")
+
+
+def groupby_apply_overtime(df_copy):
+    # The previous overtime step of extract_idle_data: datetime.time comparisons row by row, in a groupby().apply()
+    day_start = datetime.datetime.strptime('07:45:00 am', '%I:%M:%S %p').time()
+    day_end = datetime.datetime.strptime('06:15:00 pm', '%I:%M:%S %p').time()
+    night_start = datetime.datetime.strptime('07:45:00 pm', '%I:%M:%S %p').time()
+    night_end = datetime.datetime.strptime('06:15:00 am', '%I:%M:%S %p').time()
+
+    def check_overtime(start_time, end_time):
+        if pd.isna(start_time):
+            return 'FAULTY DATA'
+        if pd.isna(end_time):
+            return 'FAULTY DATA'
+
+        if night_end < start_time < day_start or night_end <= end_time <= day_start:
+            return 'YES'
+        elif day_end < start_time < night_start or day_end <= end_time:
+            return 'YES'
+        if day_start <= start_time <= day_end or day_start <= end_time <= day_end:
+            return 'NO'
+        elif night_start <= start_time <= night_end or night_start <= end_time <= night_end:
+            return 'NO'
+        else:
+            return 'FAULTY DATA'
+
+    def apply_overtime(group):
+        group['Overtime'] = group.apply(lambda row: check_overtime(row['Started On Time'], row['Stopped On Time']),
+                                        axis=1)
+        if 'YES' in group['Overtime'].values:
+            group['Overtime'] = 'YES'
+        return group
+
+    return df_copy.groupby(['Team Member', 'Started On Date']).apply(apply_overtime).reset_index(drop=True)
+
+
+def make_idle_detail_frame(rows, seed=0):
+    # The rows extract_idle_data flags for overtime: a Time Management export after the row filters, with the
+    # 'Total Hours Per Day' of each row; a few times fall on the shift bounds to the second
+    df = make_time_management_frame(rows, seed=seed)
+    rng = np.random.default_rng(seed)
+    bounds = np.array([6 * 3600 + 15 * 60, 7 * 3600 + 45 * 60, 18 * 3600 + 15 * 60, 19 * 3600 + 45 * 60])
+    on_bound = rng.random(rows) < 0.1
+    seconds = rng.choice(bounds, rows) + rng.integers(-2, 3, rows)
+    df.loc[on_bound, 'Stopped On Time'] = (pd.Timestamp('2024-01-01') + pd.to_timedelta(seconds[on_bound], unit='s')
+                                           ).strftime('%I:%M:%S %p')
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_rows, day_hours = filtered_idle_rows([df])
+    df_rows = df_rows.join(day_hours.rename('Total Hours Per Day'), on=['Team Member', 'Started On Date'])
+    # The datetime.time columns the row-wise reference functions compare
+    df_rows['Started On Time'] = df_rows['Started At'].dt.time
+    df_rows['Stopped On Time'] = df_rows['Stopped At'].dt.time
+    return df_rows
+
+
+def benchmark_idle_overtime(rows=50_000):
+    # Overtime flags of extract_idle_data: groupby().apply() of a row-wise check against mark_overtime (shift
+    # bounds as seconds since midnight, vectorized comparisons, transform('any') per Team Member and day)
+    df = make_idle_detail_frame(rows)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_apply, apply_seconds, _ = measure(groupby_apply_overtime, df.copy(), memory=False)
+    df_vectorized, vectorized_seconds, _ = measure(mark_overtime, df.copy(), memory=False)
+    # Same rows, same order, same flags
+    pd.testing.assert_frame_equal(df_apply, df_vectorized)
+
+    print(f"Idle overtime benchmark: {len(df)} clockings, {df_apply['Overtime'].value_counts().to_dict()}")
+    print(f"  groupby().apply(apply_overtime) : {apply_seconds:6.2f} s")
+    print(f"  mark_overtime                   : {vectorized_seconds:6.3f} s")
+
+
+def row_wise_idle_columns(df_copy, special_days):
+    # The previous idle hours, working hours and feedback steps of extract_idle_data: df.apply(..., axis=1) with a
+    # nested dict lookup per row
+    def calculate_idle_time(row):
+        overtime_status = row['Overtime']
+        total_hours = row['Total Hours Per Day']
+        if overtime_status == 'YES':
+            return 10.5 - total_hours
+        elif overtime_status == 'NO':
+            return 8.5 - total_hours
+
+    def feedback(row):
+        if pd.isna(row['Started On Date']):
+            return 'Unkown'
+        efficiency = row['Idle Time Percentage']
+        team_member = row['Team Member']
+        started_on = row['Started On Date']
+        if isinstance(started_on, str):
+            try:
+                started_on = pd.to_datetime(started_on)
+            except ValueError:
+                return 'Unknown'
+        if team_member in special_days:
+            date_mapping = special_days[team_member]
+            if started_on in date_mapping:
+                return date_mapping[started_on]
+        if efficiency < -10:
+            return 'Left Time Running'
+        elif -10 < efficiency < 10:
+            return 'Good Time'
+        elif efficiency > 10:
+            return 'Too Much Idle Time'
+        return 'Unknown'
+
+    def total_time(row):
+        overtime_status = row['Overtime']
+        if overtime_status == 'YES':
+            return 10.5
+        elif overtime_status == 'NO':
+            return 8.5
+
+    df_copy.loc[:, 'Idle Hours'] = df_copy.apply(calculate_idle_time, axis=1)
+    df_copy.loc[:, 'Set Working Hours'] = df_copy.apply(total_time, axis=1)
+    df_copy['Idle Time Percentage'] = (df_copy['Idle Hours'] / df_copy['Set Working Hours']) * 100
+    df_copy.loc[:, 'Feedback'] = df_copy.apply(feedback, axis=1)
+    return df_copy
+
+
+def benchmark_idle_columns(rows=50_000, sizes=(100_000, 200_000, 400_000), members=300):
+    # Idle hours, working hours and feedback: row-wise df.apply against add_idle_columns (hours mapped from the
+    # Overtime flag, np.select on the idle time percentage, leave reasons joined from a flat table), then the
+    # whole extract_idle_data on up to a year of clockings of a few hundred team members
+    df = mark_overtime(make_idle_detail_frame(rows))
+    # Leave on about one day in fifty of every team member
+    days = df[['Team Member', 'Started On Date']].drop_duplicates().sample(frac=0.02, random_state=0)
+    special_days = {}
+    for team_member, day in days.itertuples(index=False):
+        special_days.setdefault(team_member, {})[day] = 'Medical Leave'
+
+    df_apply, apply_seconds, _ = measure(row_wise_idle_columns, df.copy(), special_days, memory=False)
+    df_vectorized, vectorized_seconds, _ = measure(add_idle_columns, df, special_days, memory=False)
+    pd.testing.assert_frame_equal(df_apply, df_vectorized[df_apply.columns])
+
+    print(f"Idle columns benchmark: {len(df)} clockings, {len(days)} special days")
+    print(f"  df.apply(..., axis=1) x 3 : {apply_seconds:6.2f} s")
+    print(f"  add_idle_columns          : {vectorized_seconds:6.3f} s")
+    for size in sizes:
+        df_export = make_time_management_frame(size, members=members, days=365)
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, seconds, _ = measure(extract_idle_data, df_export, memory=False)
+        print(f"  extract_idle_data, {size:>7} rows of {members} members over a year : {seconds:6.2f} s")
+
+
+FEEDBACK_MESSAGES = {'Left Time Running': 'Leaves timer running usually', 'Good Time': 'Great job',
+                     'Too Much Idle Time': 'Try to reduce idle time', 'Unknown': 'Unknown issue, needs investigation'}
+
+
+def groupby_apply_overall_feedback(df, name):
+    # The previous overall feedback of create_summary: value_counts() and a Python tie check per Team Member
+    def overall_feedback(group):
+        feedback_counts = group['Feedback'].value_counts()
+        max_count = feedback_counts.max()
+        dominant_feedbacks = feedback_counts[feedback_counts == max_count].index.tolist()
+        if len(dominant_feedbacks) > 1:
+            return "Needs Investigation"
+        return FEEDBACK_MESSAGES.get(dominant_feedbacks[0], 'Mixed Feedback')
+
+    return df.groupby(['Team Member']).apply(overall_feedback).reset_index(name=name)
+
+
+def vectorized_overall_feedback(df, name):
+    dominant = dominant_category(df, ['Team Member'], 'Feedback')
+    messages = dominant['Dominant'].map(FEEDBACK_MESSAGES).fillna('Mixed Feedback')
+    return pd.DataFrame({'Team Member': dominant['Team Member'],
+                         name: np.where(dominant['Tied'], 'Needs Investigation', messages)})
+
+
+def benchmark_dominant_feedback(rows=500_000, members=5000, seed=0):
+    # Overall feedback of every Team Member (a mode with tie detection): groupby().apply() with value_counts()
+    # against dominant_category (one groupby size over (member, feedback) pairs); the members have few rows
+    # each, so many of them tie
+    rng = np.random.default_rng(seed)
+    feedbacks = np.array(list(FEEDBACK_MESSAGES) + ['Medical Leave'], dtype=object)
+    df = pd.DataFrame({
+        'Team Member': [f"TEAM MEMBER {number}" for number in rng.integers(0, members, rows)],
+        'Feedback': feedbacks[rng.choice(len(feedbacks), rows, p=[0.3, 0.2, 0.35, 0.05, 0.1])],
+    })
+    df_apply, apply_seconds, _ = measure(groupby_apply_overall_feedback, df, 'Overall Feedback', memory=False)
+    df_vectorized, vectorized_seconds, _ = measure(vectorized_overall_feedback, df, 'Overall Feedback',
+                                                   memory=False)
+    pd.testing.assert_frame_equal(df_apply, df_vectorized)
+
+    print(f"Dominant feedback benchmark: {rows} rows of {members} team members, "
+          f"{df_apply['Overall Feedback'].value_counts().to_dict()}")
+    print(f"  groupby().apply(overall_feedback) : {apply_seconds:6.2f} s")
+    print(f"  dominant_category                 : {vectorized_seconds:6.3f} s")
+
+
+def benchmark_idle_memory(rows=200_000):
+    # Clock times of the rows kept by the idle report: datetime.time objects ('Started On Time' /
+    # 'Stopped On Time', as the report held them) against the 'Started At' / 'Stopped At' datetime64 timestamps
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_rows, _ = filtered_idle_rows([make_time_management_frame(rows)])
+    times = pd.DataFrame({'Started On Time': df_rows['Started At'].dt.time,
+                          'Stopped On Time': df_rows['Stopped At'].dt.time})
+    timestamps = df_rows[['Started At', 'Stopped At']]
+    time_bytes = times.memory_usage(index=False, deep=True).sum()
+    timestamp_bytes = timestamps.memory_usage(index=False, deep=True).sum()
+
+    # Arithmetic on the timestamps: clocked minutes of each row, with night shifts rolled over midnight
+    minutes = (timestamps['Stopped At'] - timestamps['Started At']) / pd.Timedelta(minutes=1)
+    rolled_over = (timestamps['Stopped At'].dt.normalize() > df_rows['Started On Date']).sum()
+
+    print(f"Idle memory benchmark: {len(df_rows)} kept clockings, {rolled_over} stopped after midnight, "
+          f"{minutes.mean():.1f} clocked minutes on average")
+    print(f"  datetime.time columns       : {time_bytes / 2 ** 20:6.1f} MB "
+          f"({time_bytes / len(df_rows):.0f} bytes per row)")
+    print(f"  datetime64 timestamp columns: {timestamp_bytes / 2 ** 20:6.1f} MB "
+          f"({timestamp_bytes / len(df_rows):.0f} bytes per row)")
+
+
+def minute_grid_intervals(df, df_shifts):
+    # Reference for sweep_clock_intervals on clockings to the minute: count the clockings covering every minute;
+    # in each shift window the clocked minutes are the minutes covered at least once and the idle minutes the
+    # others, and over the whole export each minute covered k times adds k - 1 overlapping minutes
+    # Returns the clocked and idle minutes in the order of df_shifts, and the overlapping minutes
+    windows = {}
+    overlapping = 0
+    for team_member, clockings in df.groupby('Team Member'):
+        starts, stops = clockings['Started At'].to_numpy(), clockings['Stopped At'].to_numpy()
+        minutes = pd.date_range(starts.min(), stops.max(), freq='min', inclusive='left').to_numpy()
+        covering = np.zeros(len(minutes), dtype=int)
+        for start, stop in zip(starts, stops):
+            covering[np.searchsorted(minutes, start):np.searchsorted(minutes, stop)] += 1
+        overlapping += np.maximum(covering - 1, 0).sum()
+        shifts = df_shifts[df_shifts['Team Member'] == team_member]
+        for shift_start, shift_end in zip(shifts['Shift Start'].to_numpy(), shifts['Shift End'].to_numpy()):
+            covered = (covering[np.searchsorted(minutes, shift_start):np.searchsorted(minutes, shift_end)] > 0).sum()
+            # Window minutes before the first or after the last clocking are not on the grid, they are idle
+            window_minutes = (shift_end - shift_start) // np.timedelta64(1, 'm')
+            windows[team_member, pd.Timestamp(shift_start)] = (covered, window_minutes - covered)
+    clocked, idle = zip(*(windows[key] for key in zip(df_shifts['Team Member'], df_shifts['Shift Start'])))
+    return list(clocked), list(idle), overlapping
+
+
+def benchmark_clock_intervals(sizes=(100_000, 1_200_000), check_rows=3000, members=300):
+    # Idle gaps and overlapping clockings of every Team Member: sweep_clock_intervals on up to a year of clockings,
+    # checked against a minute-by-minute count on a small export
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_check, _ = filtered_idle_rows([make_time_management_frame(check_rows, members=20, days=30)])
+    df_check = df_check.dropna(subset=['Started At', 'Stopped At'])
+    df_shifts, df_gaps, df_overlaps = sweep_clock_intervals(df_check, DAY_SHIFT, NIGHT_SHIFT)
+    clocked, idle, overlapping = minute_grid_intervals(df_check, df_shifts)
+    assert df_shifts['Clocked Minutes'].tolist() == clocked
+    assert df_shifts['Idle Gap Minutes'].tolist() == idle
+    assert df_overlaps['Overlap Minutes'].sum() == overlapping
+    assert df_gaps.groupby(['Team Member', 'Shift Date', 'Shift'])['Gap Minutes'].sum().sum() == sum(idle)
+
+    print(f"Clock intervals benchmark: {len(df_shifts)} shifts of {len(df_check)} clockings match a minute-by-minute "
+          f"count ({len(df_gaps)} idle gaps, {len(df_overlaps)} overlapping clockings)")
+    for size in sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df, _ = filtered_idle_rows([make_time_management_frame(size, members=members, days=365)])
+        (df_shifts, df_gaps, df_overlaps), seconds, _ = measure(sweep_clock_intervals, df, DAY_SHIFT, NIGHT_SHIFT,
+                                                                memory=False)
+        print(f"  {len(df):>7} clockings of {members} members over a year: {seconds:6.2f} s "
+              f"({len(df_shifts)} shifts, {len(df_gaps)} idle gaps, {len(df_overlaps)} overlapping clockings)")
+
+
+def row_wise_status_styles(df):
+    # The previous classification: four df.apply(lambda row: ..., axis=1) passes
+    df['Job Situation'] = df.apply(
+        lambda row: "Late" if pd.notna(row['Job Est. Completion']) and pd.notna(row['Delivery Due Date'])
+        and row['Job Est. Completion'] > row['Delivery Due Date'] else "On Time", axis=1)
+    df['job_color'] = df.apply(
+        lambda row: "darkred" if pd.notna(row['Job Est. Completion']) and pd.notna(row['Delivery Due Date'])
+        and row['Job Est. Completion'] > row['Delivery Due Date']
+        else ("green" if pd.notna(row['Job Est. Completion']) and pd.notna(row['Delivery Due Date']) else 'grey'),
+        axis=1)
+    df['operation_status_color'] = df.apply(
+        lambda row: "orange" if row['Operation'] in ['Threading and Surface Coating', 'Threading', 'Surface Coating']
+        else "grey" if row['Status'] == 'Paused' else "blue" if row['Status'] == 'complete'
+        else "purple" if row['Status'] == 'Pending' else "cyan" if row['Status'] == 'Ready'
+        else "yellowgreen" if row['Status'] == 'Running' else 'black', axis=1)
+    df['operation_line_color'] = df.apply(
+        lambda row: "rgba(255, 87, 51, 0.5)" if row['Operation'] in ['Threading and Surface Coating', 'Threading',
+                                                                     'Surface Coating', 'Induction Hardening', 'Xylan']
+        else "rgba(61, 61, 61, 0.5)" if row['Status'] == 'Paused'
+        else "rgba(89, 136, 255, 0.5)" if row['Status'] == 'complete'
+        else "rgba(128, 0, 128, 0.5)" if row['Status'] == 'Pending'
+        else "rgba(141, 228, 255, 0.5)" if row['Status'] == 'Ready'
+        else "rgba(80, 247, 0, 0.7)" if row['Status'] == 'Running' else 'black', axis=1)
+    return df
+
+
+def make_status_frame(rows, seed=0):
+    # Random job dates (about 5% missing), statuses and operation names
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2024-08-01', tz='Asia/Kuala_Lumpur')
+    estimated = start + pd.to_timedelta(rng.integers(0, 120, rows), unit='D')
+    due = start + pd.to_timedelta(rng.integers(0, 120, rows), unit='D')
+    df = pd.DataFrame({
+        'Job Est. Completion': pd.Series(estimated).mask(rng.random(rows) < 0.05),
+        'Delivery Due Date': pd.Series(due).mask(rng.random(rows) < 0.05),
+        'Status': rng.choice(OPERATION_STATUSES + ['Cancelled'], rows),
+        'Operation': rng.choice(OPERATION_NAMES + ['Threading and Surface Coating'], rows),
+    })
+    df.loc[rng.random(rows) < 0.01, 'Status'] = None
+    return df
+
+
+def benchmark_status_styles(sizes=(10_000, 100_000, 1_000_000)):
+    # Row-wise apply against the vectorized style lookups of generate_gantt_chart
+    print("Status style benchmark (four row-wise applies vs vectorized lookups)")
+    for rows in sizes:
+        df = make_status_frame(rows)
+        df_rows, rows_seconds, _ = measure(row_wise_status_styles, df.copy(), memory=False)
+        df_vectorized, vectorized_seconds, _ = measure(add_status_styles, df.copy(), memory=False)
+        pd.testing.assert_frame_equal(df_rows, df_vectorized)
+        print(f"  {rows:>9} rows: apply {rows_seconds:7.2f} s, vectorized {vectorized_seconds:.3f} s "
+              f"({rows_seconds / vectorized_seconds:.0f}x faster, identical output)")
+
+
+def lambda_group_fill(df_combined):
+    # The previous fill: one groupby().transform(lambda x: x.ffill().bfill()) per column
+    for column in JOB_FILL_COLUMNS:
+        df_combined[column] = (df_combined.groupby('Job')[column]
+                               .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
+    return df_combined
+
+
+def make_combined_frame(job_count, rows_per_job=10, seed=0):
+    # A frame shaped like df_combined in process_df: API rows and Excel rows of the same jobs, each missing
+    # some of the job-level attributes, sorted by Job (a few rows have no Job)
+    rng = np.random.default_rng(seed)
+    rows = job_count * rows_per_job
+    jobs = np.repeat(np.arange(1, job_count + 1, dtype=float), rows_per_job)
+    jobs[rng.random(rows) < 0.01] = np.nan
+    created = pd.Timestamp('2024-08-01') + pd.to_timedelta(jobs * 3600, unit='s')
+    df = pd.DataFrame({
+        'Job': jobs,
+        'Date Created': pd.Series(created.astype(str), dtype=object),
+        'Delivery Due Date': pd.Series(created + pd.Timedelta(days=30)),
+        'Make Item': pd.Series(jobs).map(lambda job: f"ITEM-{job:.0f}"),
+        'Customer': pd.Series(jobs).map(lambda job: f"Customer {job % 40:.0f}"),
+        'Production Due Date': pd.Series(created + pd.Timedelta(days=20)),
+        'Planned Quantity': jobs % 7 + 1,
+        'Job Est. Completion': pd.Series((created + pd.Timedelta(days=25)).astype(str), dtype=object),
+        'Job Status': np.where(jobs % 2 == 0, 'In Progress', 'Scheduled').astype(object),
+    })
+    for column in JOB_FILL_COLUMNS:
+        df.loc[rng.random(rows) < 0.6, column] = np.nan
+    return df.sort_values(by='Job')
+
+
+def benchmark_group_fill(job_count=5000, rows_per_job=10):
+    # Per-column lambda transforms against the single grouped ffill/bfill of process_df
+    pd.set_option('future.no_silent_downcasting', True)
+    df = make_combined_frame(job_count, rows_per_job)
+    df_lambda, lambda_seconds, _ = measure(lambda_group_fill, df.copy(), memory=False)
+    df_single, single_seconds, _ = measure(fill_job_columns, df.copy(), memory=False)
+    pd.testing.assert_frame_equal(df_lambda, df_single)
+    print(f"Group fill benchmark: {len(df)} rows, {job_count} jobs (identical output)")
+    print(f"  Lambda transform per column : {lambda_seconds:.2f} s")
+    print(f"  Single grouped ffill/bfill  : {single_seconds:.3f} s")
+
+
+def string_round_trip_dates(df):
+    # The previous date path: process_df parsed the API dates, wrote Actual Start/End back as
+    # 'DD/MM/YYYY HH:MM:SS' strings, then generate_gantt_chart parsed them again and localized five columns
+    df = df.copy()
+    for column in ['Actual Start', 'Actual End']:
+        df[column] = pd.to_datetime(df[column], errors='coerce').dt.strftime('%d/%m/%Y %H:%M:%S')
+    df['Delivery Due Date'] = pd.to_datetime(df['Delivery Due Date'], errors='coerce')
+    df['Start'] = df['Actual Start']
+    df['End'] = df['Actual End']
+
+    df['Date Created'] = pd.to_datetime(df['Date Created'], errors='coerce')
+    df['Delivery Due Date'] = pd.to_datetime(df['Delivery Due Date'], format='%Y/%m/%d', errors='coerce')
+    df['Job Est. Completion'] = pd.to_datetime(df['Job Est. Completion'], errors='coerce')
+    df['Start'] = pd.to_datetime(df['Start'], dayfirst=True, errors='coerce')
+    df['End'] = pd.to_datetime(df['End'], dayfirst=True, errors='coerce')
+    for column in ['Date Created', 'Delivery Due Date', 'Job Est. Completion', 'Start', 'End']:
+        if df[column].dt.tz is None:
+            df[column] = df[column].dt.tz_localize('Asia/Kuala_Lumpur', nonexistent='shift_forward', ambiguous='NaT')
+        else:
+            df[column] = df[column].dt.tz_convert('Asia/Kuala_Lumpur')
+    return df
+
+
+def typed_dates(df):
+    # The current date path: every API date is parsed once with its known format, Start/End reuse the result
+    df = df.copy()
+    for column, (format, utc) in API_DATETIME_FORMATS.items():
+        df[column] = to_gantt_datetime(df[column], format, utc)
+    df['Start'] = df['Actual Start']
+    df['End'] = df['Actual End']
+    return df
+
+
+def benchmark_date_parse(job_count=20000, operations_per_job=8):
+    # Parse cost of the API dates from the raw strings to the tz-aware columns the Gantt chart draws
+    jobs = [make_job(job_id) for job_id in range(1, job_count + 1)]
+    rows = []
+    for job in jobs:
+        sales_order = make_sales_order(job['salesOrderId'])
+        for item in make_operations(job['id'], operations_per_job):
+            rows.append({'Date Created': job['createdUtc'], 'Job Est. Completion': job['scheduledEndUtc'],
+                         'Delivery Due Date': sales_order['deliveryDueDate'],
+                         'Actual Start': item['operation']['scheduledStartUtc'],
+                         'Actual End': item['operation']['completedOnUtc']})
+    df = pd.DataFrame(rows)
+
+    df_strings, strings_seconds, _ = measure(string_round_trip_dates, df, memory=False)
+    df_typed, typed_seconds, _ = measure(typed_dates, df, memory=False)
+
+    # Same dates, except Start/End: the string round trip dropped their UTC offset, so the operations were drawn
+    # 8 hours early (UTC read as local time); the typed path converts them to local time instead
+    for column in ['Date Created', 'Job Est. Completion', 'Delivery Due Date']:
+        pd.testing.assert_series_equal(df_strings[column], df_typed[column])
+    for column in ['Start', 'End']:
+        pd.testing.assert_series_equal(df_strings[column].dt.tz_localize(None),
+                                       df_typed[column].dt.tz_convert('UTC').dt.tz_localize(None))
+
+    print(f"Date parse benchmark: {len(df)} operation rows")
+    print(f"  String round trip : {strings_seconds:.2f} s")
+    print(f"  Parsed once       : {typed_seconds:.2f} s")
+
+
+BENCHMARKS = {
+    'api-client': benchmark_api_client,
+    'api-cache': benchmark_api_cache,
+    'api-scale': benchmark_api_scale,
+    'api-frame': benchmark_api_frame,
+    'gantt-render': benchmark_gantt_render,
+    'gantt-window': benchmark_gantt_window,
+    'gantt-pipeline': benchmark_gantt_pipeline,
+    'workbook-load': benchmark_workbook_load,
+    'workbook-cache': benchmark_workbook_cache,
+    'status-styles': benchmark_status_styles,
+    'group-fill': benchmark_group_fill,
+    'date-parse': benchmark_date_parse,
+    'idle-stream': benchmark_idle_stream,
+    'session': benchmark_session,
+    'idle-overtime': benchmark_idle_overtime,
+    'idle-columns': benchmark_idle_columns,
+    'dominant-feedback': benchmark_dominant_feedback,
+    'idle-memory': benchmark_idle_memory,
+    'clock-intervals': benchmark_clock_intervals,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run EffiView performance benchmarks")
+    parser.add_argument('names', nargs='*', help=f"Benchmarks to run, any of {', '.join(BENCHMARKS)} (all when left empty)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -0,0 +1,18 @@
+import pandas as pd
+
+
+def dominant_category(df, keys, column):
+    # Most frequent value of `column` for each combination of `keys` (e.g. the usual feedback of each Team Member),
+    # counted in one groupby over (keys, value) pairs instead of a value_counts() per group
+    # Returns a DataFrame with the keys and:
+    #   - 'Dominant': the most frequent value (one of them when several share the highest count)
+    #   - 'Tied': True when several values share the highest count
+    # Rows with a missing key or value are not counted, like groupby() and value_counts() skip them
+    keys = list(keys)
+    counts = df.groupby(keys + [column]).size().rename('Count').reset_index()
+    top = counts[counts['Count'] == counts.groupby(keys)['Count'].transform('max')]
+    grouped = top.groupby(keys)
+    return pd.DataFrame({
+        'Dominant': grouped[column].first(),
+        'Tied': grouped.size() > 1,
+    }).reset_index()
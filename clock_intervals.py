@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+MINUTE = np.timedelta64(1, 'm')
+
+
+def shift_of(timestamps, day_shift, night_shift):
+    # Shift each timestamp belongs to: (is_night, shift_date, window_start, window_end)
+    # day_shift / night_shift are (start, end) in minutes since midnight, the night shift ending the next day
+    # A time between two shifts (overtime) belongs to the nearest one: the day shift owns the times from halfway
+    # between the night end and the day start to halfway between the day end and the night start
+    (day_start, day_end), (night_start, night_end) = day_shift, night_shift
+    day_from = (night_end + day_start) // 2
+    day_until = (day_end + night_start) // 2
+
+    dates = timestamps.astype('datetime64[D]')
+    minutes = (timestamps - dates) // MINUTE
+    is_night = (minutes < day_from) | (minutes >= day_until)
+    # Before the day shift: the night shift that started the evening before
+    shift_date = dates - (minutes < day_from).astype('int64').astype('timedelta64[D]')
+    window_start = shift_date + np.where(is_night, night_start, day_start).astype('timedelta64[m]')
+    window_end = shift_date + np.where(is_night, night_end + 24 * 60, day_end).astype('timedelta64[m]')
+    return is_night, shift_date, window_start.astype('datetime64[ns]'), window_end.astype('datetime64[ns]')
+
+
+def sweep_clock_intervals(df, day_shift, night_shift):
+    # Sweep line over the clockings ('Started At' to 'Stopped At') of each Team Member: the clockings are sorted
+    # once by member and start, the running latest stop of each member tells whether a clocking overlaps an
+    # earlier one or starts a new block of work, and the blocks are cut to the shift windows to find the gaps
+    # Clockings without both timestamps are skipped
+    # Returns three DataFrames:
+    #   - shifts: clocked, idle and overlapping minutes of each shift a member worked
+    #   - gaps: the idle gaps inside the shift windows
+    #   - overlaps: the clockings that overlap an earlier clocking of the same member, with that clocking
+    df = df[df['Started At'].notna() & df['Stopped At'].notna() & df['Team Member'].notna()]
+    member_codes, members = pd.factorize(df['Team Member'])
+    starts = df['Started At'].to_numpy('datetime64[ns]')
+    stops = df['Stopped At'].to_numpy('datetime64[ns]')
+    order = np.lexsort((starts, member_codes))
+    codes, starts, stops = member_codes[order], starts[order], stops[order]
+    rows = df.iloc[order]
+
+    count = len(codes)
+    positions = np.arange(count)
+    first_of_member = np.ones(count, dtype=bool)
+    first_of_member[1:] = codes[1:] != codes[:-1]
+
+    # Latest stop so far of each member, and the clocking that holds it
+    latest_stop = pd.Series(stops).groupby(codes).cummax().to_numpy('datetime64[ns]')
+    holder = np.maximum.accumulate(np.where(stops >= latest_stop, positions, -1))
+    previous_stop = np.empty_like(latest_stop)
+    previous_stop[1:] = latest_stop[:-1]
+    previous_holder = np.empty_like(holder)
+    previous_holder[1:] = holder[:-1]
+
+    # A clocking starting before the latest stop of the member overlaps the clocking holding that stop
+    overlapping = ~first_of_member & (starts < previous_stop)
+    overlap_stops = np.minimum(stops, previous_stop)[overlapping]
+    overlapped = rows.iloc[previous_holder[overlapping]]
+    overlaps = pd.DataFrame({
+        'Team Member': rows['Team Member'].to_numpy()[overlapping],
+        'Job': rows['Job'].to_numpy()[overlapping],
+        'Operation': rows['Operation'].to_numpy()[overlapping],
+        'Started At': starts[overlapping],
+        'Stopped At': stops[overlapping],
+        'Overlapped Job': overlapped['Job'].to_numpy(),
+        'Overlapped Operation': overlapped['Operation'].to_numpy(),
+        'Overlapped Started At': overlapped['Started At'].to_numpy(),
+        'Overlapped Stopped At': overlapped['Stopped At'].to_numpy(),
+        'Overlap Start': starts[overlapping],
+        'Overlap End': overlap_stops,
+    })
+    overlaps['Overlap Minutes'] = (overlaps['Overlap End'] - overlaps['Overlap Start']) / MINUTE
+
+    # Blocks of continuous work: a clocking starting after the latest stop so far starts a new block
+    block_first = first_of_member | (starts > previous_stop)
+    block_index = np.flatnonzero(block_first)
+    block_codes = codes[block_index]
+    block_starts = starts[block_index]
+    block_stops = np.maximum.reduceat(stops, block_index) if count else stops
+
+    # Each block counts in the shift window its start belongs to and, when it runs past its window, in the next
+    # window of the same member (e.g. a day shift clocking that carries on into the night shift the member works)
+    is_night, shift_date, window_start, window_end = shift_of(block_starts, day_shift, night_shift)
+    pieces = pd.DataFrame({'code': block_codes, 'is_night': is_night, 'shift_date': shift_date,
+                           'window_start': window_start, 'window_end': window_end,
+                           'start': block_starts, 'stop': block_stops})
+    worked = pieces[['code', 'window_start']].drop_duplicates()
+    spill = pieces[pieces['stop'] > pieces['window_end']]
+    if len(spill):
+        # The next shift starts the same evening after a day shift, the next morning after a night shift
+        shift_dates = spill['shift_date'].to_numpy('datetime64[D]')
+        next_shift_start = np.where(spill['is_night'], shift_dates + np.timedelta64(1, 'D') + day_shift[0] * MINUTE,
+                                    shift_dates + night_shift[0] * MINUTE)
+        next_night, next_date, next_start, next_end = shift_of(next_shift_start, day_shift, night_shift)
+        spill = spill.assign(is_night=next_night, shift_date=next_date, window_start=next_start,
+                             window_end=next_end)
+        spill = spill.merge(worked, on=['code', 'window_start'])
+        pieces = pd.concat([pieces, spill], ignore_index=True)
+    pieces['start'] = np.maximum(pieces['start'].to_numpy(), pieces['window_start'].to_numpy())
+    pieces['stop'] = np.minimum(pieces['stop'].to_numpy(), pieces['window_end'].to_numpy())
+    pieces = pieces[pieces['stop'] > pieces['start']].sort_values(['code', 'window_start', 'start'], kind='stable')
+
+    # Gaps of each window: before its first block, between its blocks and after its last block
+    window = ['code', 'window_start']
+    first_of_window = (pieces[window] != pieces[window].shift()).any(axis=1)
+    last_of_window = (pieces[window] != pieces[window].shift(-1)).any(axis=1)
+    gap_start = pieces['stop'].shift().where(~first_of_window, pieces['window_start'])
+    leading = pieces.assign(gap_start=gap_start, gap_end=pieces['start'])
+    trailing = pieces[last_of_window].assign(gap_start=pieces['stop'], gap_end=pieces['window_end'])
+    gaps = pd.concat([leading, trailing]).query('gap_end > gap_start')
+    gaps = gaps.sort_values(['code', 'window_start', 'gap_start'], kind='stable').reset_index(drop=True)
+
+    def labelled(frame, columns):
+        return pd.DataFrame({'Team Member': members.to_numpy()[frame['code'].to_numpy()],
+                             'Shift': np.where(frame['is_night'], 'Night', 'Day'),
+                             'Shift Date': frame['shift_date'].to_numpy('datetime64[ns]'),
+                             **columns}, index=frame.index)
+
+    df_gaps = labelled(gaps, {'Gap Start': gaps['gap_start'], 'Gap End': gaps['gap_end'],
+                              'Gap Minutes': (gaps['gap_end'] - gaps['gap_start']) / MINUTE})
+
+    # Minutes of each shift window: clocked (union of the clockings), idle (the gaps) and overlapping
+    shifts = pieces.assign(clocked=(pieces['stop'] - pieces['start']) / MINUTE).groupby(window, sort=False).agg(
+        is_night=('is_night', 'first'), shift_date=('shift_date', 'first'), window_end=('window_end', 'first'),
+        clocked=('clocked', 'sum')).reset_index()
+    gap_totals = gaps.assign(minutes=df_gaps['Gap Minutes']).groupby(window)['minutes'].agg(['sum', 'size'])
+    shifts = shifts.join(gap_totals, on=window)
+    df_shifts = labelled(shifts, {'Shift Start': shifts['window_start'], 'Shift End': shifts['window_end'],
+                                  'Clocked Minutes': shifts['clocked'],
+                                  'Idle Gap Minutes': shifts['sum'].fillna(0),
+                                  'Idle Gaps': shifts['size'].fillna(0).astype('int64')})
+    overlap_shift = shift_of(overlaps['Overlap Start'].to_numpy('datetime64[ns]'), day_shift, night_shift)[2]
+    overlap_totals = overlaps.groupby([overlaps['Team Member'], overlap_shift])['Overlap Minutes'].sum()
+    df_shifts = df_shifts.join(overlap_totals, on=['Team Member', 'Shift Start'])
+    df_shifts['Overlap Minutes'] = df_shifts['Overlap Minutes'].fillna(0)
+    return df_shifts.reset_index(drop=True), df_gaps.reset_index(drop=True), overlaps
@@ -0,0 +1,271 @@
+import asyncio  # Used to run many API calls concurrently on a single thread
+import aiohttp  # Async HTTP client that keeps a pool of keep-alive connections
+from request_scheduler import RequestScheduler
+
+# Base URL of the Fulcrum API
+FULCRUM_API_URL = 'https://api.fulcrumpro.com/api'
+
+# Authorization key (very important, share with authorized people only)
+FULCRUM_API_TOKEN = 'authorization key here'
+
+# Number of API calls in flight at the start of a run, the scheduler then adapts it (AIMD) up to the maximum
+DEFAULT_INITIAL_CONCURRENCY = 10
+DEFAULT_MAX_CONCURRENCY = 50
+
+# Average number of API calls sent per second (None for no limit)
+DEFAULT_RATE_LIMIT = 100
+
+# Number of jobs requested per page of /jobs/list, and how many pages are requested ahead of the one being read
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_PREFETCH_PAGES = 4
+
+# Fields of a job that change whenever the job changes, the first one the API supplies is used as its version
+# (names not confirmed against the real API: when none is sent, every job is revalidated with If-None-Match)
+# Only the job record itself is trusted to this version, its operations are always revalidated, see list_operations
+JOB_VERSION_FIELDS = ('modifiedUtc', 'updatedUtc', 'lastModifiedUtc')
+
+
+class FulcrumApiError(Exception):
+    # Raised by a request graph node when the API did not answer with status 200
+    def __init__(self, status_code):
+        super().__init__(f"status code {status_code}")
+        self.status_code = status_code
+
+
+def job_version(job):
+    # Return the change-detection key of a job from the job list, or None when the API does not supply one
+    return next((job[field] for field in JOB_VERSION_FIELDS if job.get(field)), None)
+
+
+class FulcrumClient:
+    # Async client for the Fulcrum API that reuses one pooled, keep-alive session for every call
+    # Use it as "async with FulcrumClient() as client:" so the session is opened and closed once per run
+    # When an ApiCache is given, jobs, sales orders and operation lists are served from it while they are current
+    # Every call goes through a RequestScheduler (rate limit, adaptive concurrency, retries on 429/5xx)
+
+    def __init__(self, base_url=FULCRUM_API_URL, token=FULCRUM_API_TOKEN,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=60, cache=None, rate_limit=DEFAULT_RATE_LIMIT):
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.cache = cache
+        # Version of every job seen in the job list, used to tell whether its cached responses are still current
+        self.job_versions = {}
+        self.session = None
+        self.scheduler = None
+
+    async def __aenter__(self):
+        # The connector limit matches the largest concurrency limit, so each in-flight call owns one pooled connection
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.scheduler = RequestScheduler(self.rate_limit, DEFAULT_INITIAL_CONCURRENCY, self.max_concurrency,
+                                          retry_exceptions=(aiohttp.ClientConnectionError, asyncio.TimeoutError))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self.session = None
+
+    async def request(self, method, path, endpoint=None, cache_key=None, version=None, **kwargs):
+        # Make a request and return (status_code, json data); data is None when the call was not successful
+        # endpoint names the call in the latency/retry report, e.g. 'GET /jobs/{id}'
+        # With a cache_key the response is read from / written to the cache: an entry whose version matches is used
+        # as is (see ApiCache.is_fresh), any other cached entry is revalidated with If-None-Match
+        url = f"{self.base_url}{path}"
+
+        entry = None
+        if self.cache is not None and cache_key is not None:
+            entry = self.cache.get(cache_key)
+            if self.cache.is_fresh(entry, version):
+                self.cache.hits += 1
+                return 200, entry['data']
+            # Ask the API to answer 304 Not Modified when the cached copy is still current
+            if entry is not None and entry['etag']:
+                kwargs['headers'] = {**kwargs.get('headers', {}), 'If-None-Match': entry['etag']}
+
+        async def send():
+            async with self.session.request(method, url, **kwargs) as response:
+                data = await response.json(content_type=None) if response.status == 200 else None
+                return response.status, response.headers, data
+
+        status_code, headers, data = await self.scheduler.run(endpoint or f"{method} {path}", send)
+        if status_code == 304 and entry is not None:
+            self.cache.revalidated += 1
+            self.cache.touch(cache_key, version)
+            return 200, entry['data']
+        if status_code != 200:  # status_code = 200 means extraction was successful
+            return status_code, None
+        etag = headers.get('ETag')
+
+        if self.cache is not None and cache_key is not None:
+            self.cache.misses += 1
+            self.cache.put(cache_key, data, etag, version)
+        return 200, data
+
+    async def list_jobs(self, status, take, skip):
+        # Filters job ids extracted according to status (Note : when left empty api doesn't extract all jobs)
+        # status can be a status name ("inProgress") or a full filter payload ({"status": "complete", ...})
+        payload = status if isinstance(status, dict) else {'status': status}
+        return await self.request('POST', '/jobs/list', 'POST /jobs/list', params={'take': take, 'skip': skip},
+                                  json=payload,
+                                  headers={'Content-Type': 'application/json-patch+json'})
+
+    async def iter_job_pages(self, status, take=DEFAULT_PAGE_SIZE, prefetch_pages=DEFAULT_PREFETCH_PAGES):
+        # Yield every page of jobs for one status, in order, keeping prefetch_pages requests in flight
+        # A page shorter than the page size is the last one, so the pages requested after it are cancelled
+        skip = 0
+        pending = []
+        try:
+            while True:
+                while len(pending) < prefetch_pages:
+                    pending.append(asyncio.create_task(self.list_jobs(status, take, skip)))
+                    skip += take
+
+                status_code, jobs_data = await pending.pop(0)
+                if jobs_data is None:
+                    print(f"Failed to get job list for {status} with status code {status_code}")
+                    return
+
+                yield jobs_data
+                if len(jobs_data) < take:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_job_ids(self, statuses, take=DEFAULT_PAGE_SIZE, prefetch_pages=DEFAULT_PREFETCH_PAGES):
+        # Yield the job ids of several statuses as soon as their pages arrive, every status is paged concurrently
+        # A job that matches more than one status is only yielded once
+        queue = asyncio.Queue()
+
+        async def enumerate_status(status):
+            try:
+                async for jobs_data in self.iter_job_pages(status, take, prefetch_pages):
+                    for job in jobs_data:
+                        self.job_versions[job['id']] = job_version(job)
+                        queue.put_nowait(job['id'])
+            except Exception as e:
+                print(f"An error occurred while listing jobs for {status}: {e}")
+            finally:
+                # None tells the reader that this status is finished
+                queue.put_nowait(None)
+
+        producers = [asyncio.create_task(enumerate_status(status)) for status in statuses]
+        seen = set()
+        finished = 0
+        try:
+            while finished < len(producers):
+                job_id = await queue.get()
+                if job_id is None:
+                    finished += 1
+                elif job_id not in seen:
+                    seen.add(job_id)
+                    yield job_id
+        finally:
+            for producer in producers:
+                producer.cancel()
+
+    async def get_job(self, job_id):
+        return await self.request('GET', f'/jobs/{job_id}', 'GET /jobs/{id}', cache_key=f'job:{job_id}',
+                                  version=self.job_versions.get(job_id))
+
+    async def get_sales_order(self, sales_order_id):
+        return await self.request('GET', f'/sales-orders/{sales_order_id}', 'GET /sales-orders/{id}',
+                                  cache_key=f'sales-order:{sales_order_id}')
+
+    async def list_operations(self, job_id):
+        # An operation can start or complete without the job's modified timestamp changing, so the cached operations
+        # are always revalidated with If-None-Match (a 304 costs a call but no download)
+        return await self.request('POST', f'/jobs/{job_id}/operations/list', 'POST /jobs/{id}/operations/list',
+                                  cache_key=f'operations:{job_id}',
+                                  headers={'Content-Type': 'application/json'})
+
+
+class SalesOrderCache:
+    # Run-scoped cache of sales orders, many work orders share the same sales order
+    # Two jobs asking for the same sales order at the same time share a single HTTP call (coalescing)
+    # Every lookup runs on the client's event loop, so checking and filling the cache never interleave
+
+    def __init__(self, client):
+        self.client = client
+        self.tasks = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, sales_order_id):
+        task = self.tasks.get(sales_order_id)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self.client.get_sales_order(sales_order_id))
+            self.tasks[sales_order_id] = task
+        elif task.done():
+            self.hits += 1
+        else:
+            self.coalesced += 1
+
+        try:
+            # shield() so a cancelled job does not cancel the call other jobs are waiting on
+            status_code, sales_data = await asyncio.shield(task)
+        except Exception:
+            self.forget(sales_order_id, task)
+            raise
+
+        # Failed calls are not kept, so the next job asking for this sales order tries again
+        if sales_data is None:
+            self.forget(sales_order_id, task)
+        return status_code, sales_data
+
+    def forget(self, sales_order_id, task):
+        if self.tasks.get(sales_order_id) is task:
+            del self.tasks[sales_order_id]
+
+    def report(self):
+        return f"Sales order cache: {self.hits} hits, {self.misses} misses, {self.coalesced} coalesced"
+
+
+async def fetch_json(request):
+    # Await a client call and return its data, raising FulcrumApiError when it was not successful
+    status_code, data = await request
+    if data is None:
+        raise FulcrumApiError(status_code)
+    return data
+
+
+async def run_graph(nodes):
+    # Run a small graph of dependent API calls, every node starts as soon as the nodes it depends on are done
+    # nodes maps a name to (dependencies, function); the function receives the results of its dependencies
+    # Returns (results, errors): a failed node and the nodes that depend on it end up in errors, the rest still run
+    tasks = {}
+
+    async def run_node(name):
+        dependencies, function = nodes[name]
+        arguments = []
+        for dependency in dependencies:
+            try:
+                arguments.append(await tasks[dependency])
+            except Exception:
+                raise RuntimeError(f"skipped, {dependency} failed")
+        return await function(*arguments)
+
+    for name in nodes:
+        tasks[name] = asyncio.create_task(run_node(name))
+
+    results, errors = {}, {}
+    for name, task in tasks.items():
+        try:
+            results[name] = await task
+        except Exception as e:
+            errors[name] = e
+    return results, errors
+
+
+def run_sync(coroutine_function, *args, **kwargs):
+    # Run a coroutine function to completion from normal (non-async) code, e.g. from process_df or a Tk handler
+    return asyncio.run(coroutine_function(*args, **kwargs))
@@ -0,0 +1,328 @@
+import argparse  # Used to run the server from the terminal
+import datetime  # Used to build the job and operation dates
+import gzip  # Recordings are stored as gzip-compressed NDJSON
+import hashlib  # Used to build the ETags
+import json  # Used to build the JSON responses
+import random  # Used to build the dataset and to inject latency and errors
+import re  # Used to match the API paths
+import sys
+import threading  # Used to run the server in the background
+import time  # Used to simulate the API latency
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit  # Used to read take/skip from the job list URL
+
+import requests  # Used to forward calls to the real API when recording
+
+from fulcrum_client import FULCRUM_API_URL
+
+
+# Local stand-in for the Fulcrum API, used to benchmark and regression-test extract_data_from_api
+# without a real bearer token. It serves /jobs/list, /jobs/{id}, /jobs/{id}/operations/list and
+# /sales-orders/{id} with the same JSON shapes that gantt_chart.py indexes into, in one of three modes:
+#   - synthetic: a generated dataset of any size, with configurable latency and error rates
+#   - record: forwards every call to the real API and saves the responses to a .ndjson.gz file
+#   - replay: answers from a recording, so a real dataset can be benchmarked offline
+
+OPERATION_NAMES = ['Saw Cutting', 'Turning', 'Milling', 'Threading', 'Surface Coating', 'Induction Hardening',
+                   'Xylan', 'Inspection', 'Packing']
+OPERATION_STATUSES = ['complete', 'Running', 'Pending', 'Ready', 'Paused']
+ITEM_DESCRIPTIONS = ['Mandrel body', 'Tieback extension', 'Polished bore receptacle', 'Crossover sub',
+                     'Flow coupling', 'Blast joint', 'Millout extension']
+
+# Dates of the generated dataset are spread over the months after this day
+DATASET_START = datetime.datetime(2024, 8, 1, 8, 0)
+DEFAULT_MODIFIED = '2024-09-01T08:00:00Z'
+
+
+def utc(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def make_job(job_id, statuses=('inProgress',), modified=DEFAULT_MODIFIED, jobs_per_sales_order=3):
+    # Every value is derived from the job id, so the same job always looks the same
+    rng = random.Random(job_id)
+    created = DATASET_START + datetime.timedelta(days=rng.randint(0, 60), minutes=rng.randint(0, 600))
+    return {
+        'id': job_id,
+        'status': statuses[job_id % len(statuses)],
+        'modifiedUtc': modified,
+        'name': str(job_id),
+        # Several jobs share one sales order, like on the shop floor
+        'salesOrderId': f"so-{job_id // jobs_per_sales_order}",
+        'createdUtc': utc(created),
+        'scheduledEndUtc': utc(created + datetime.timedelta(days=rng.randint(10, 60)))
+    }
+
+
+def make_sales_order(sales_order_id):
+    number = int(sales_order_id.split('-')[-1])
+    rng = random.Random(f"so-{number}")
+    due = DATASET_START + datetime.timedelta(days=rng.randint(20, 110))
+    return {
+        'id': sales_order_id,
+        'number': f"SO{number}",
+        'deliveryDueDate': due.strftime('%Y/%m/%d')
+    }
+
+
+def make_operations(job_id, operations_per_job=5):
+    rng = random.Random(-job_id)
+    start = DATASET_START + datetime.timedelta(days=rng.randint(0, 70))
+    item = {'itemReference': {'number': f"ITEM-{job_id % 500}", 'description': rng.choice(ITEM_DESCRIPTIONS)}}
+    operations = []
+    for step in range(1, operations_per_job + 1):
+        end = start + datetime.timedelta(hours=rng.randint(1, 30))
+        status = rng.choice(OPERATION_STATUSES)
+        operations.append({
+            'itemToMake': item,
+            'operation': {
+                'status': status,
+                'order': step,
+                'scheduledStartUtc': utc(start),
+                'instructions': '',
+                'completedOnUtc': utc(end) if status == 'complete' else None,
+                'name': rng.choice(OPERATION_NAMES)
+            }
+        })
+        start = end
+    return operations
+
+
+def request_key(method, path, body):
+    # Calls are matched on method, path (with query string) and JSON body when replaying
+    body = json.dumps(json.loads(body), sort_keys=True) if body else ''
+    return f"{method} {path} {body}"
+
+
+class Recording:
+    # Calls and responses saved as gzip-compressed NDJSON, one {"method", "path", "body", "status", "response"}
+    # object per line
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.responses = {}
+        self.file = None
+
+    def load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                record = json.loads(line)
+                key = request_key(record['method'], record['path'], record['body'])
+                self.responses[key] = (record['status'], record['response'])
+        return self
+
+    def lookup(self, method, path, body):
+        return self.responses.get(request_key(method, path, body), (404, {'error': 'not recorded'}))
+
+    def append(self, method, path, body, status, response):
+        line = json.dumps({'method': method, 'path': path, 'body': body.decode() if body else '',
+                           'status': status, 'response': response})
+        with self.lock:
+            # One gzip stream for the whole recording, it is finished when the server shuts down
+            if self.file is None:
+                self.file = gzip.open(self.path, 'at', encoding='utf-8')
+            self.file.write(line + '\n')
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class FulcrumStubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep their connections alive between requests
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # Keep the benchmark output clean
+        pass
+
+    def send_json(self, data, status=200, headers=None):
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        # Answer 304 Not Modified when the client already holds this exact response
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        self.handle_call('GET', b'')
+
+    def do_POST(self):
+        self.handle_call('POST', self.read_body())
+
+    def handle_call(self, method, body):
+        server = self.server
+        time.sleep(server.latency + random.uniform(0, server.latency_jitter))
+
+        if server.upstream is not None:
+            status, data = self.forward(method, body)
+            server.recording.append(method, self.path, body, status, data)
+            return self.send_json(data, status)
+
+        # Injected failures, so retries and partial results can be exercised
+        roll = random.random()
+        if roll < server.throttle_rate:
+            return self.send_json({'error': 'too many requests'}, 429, {'Retry-After': '1'})
+        if roll < server.throttle_rate + server.error_rate:
+            return self.send_json({'error': 'internal server error'}, 500)
+
+        if server.recording is not None:
+            status, data = server.recording.lookup(method, self.path, body)
+        else:
+            status, data = self.synthetic_response(method, body)
+        self.send_json(data, status)
+
+    def forward(self, method, body):
+        # The stand-in serves the API under /api, the same as the real base URL
+        url = self.server.upstream.rstrip('/') + self.path[len('/api'):]
+        headers = {name: self.headers[name] for name in ('Authorization', 'Content-Type') if self.headers[name]}
+        response = requests.request(method, url, headers=headers, data=body or None)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, {'error': response.text}
+
+    def synthetic_response(self, method, body):
+        server = self.server
+        url = urlsplit(self.path)
+        path = url.path
+
+        if method == 'GET':
+            if match := re.fullmatch(r'/api/jobs/(\d+)', path):
+                job_id = int(match.group(1))
+                if 1 <= job_id <= server.job_count:
+                    return 200, server.make_job(job_id)
+            if match := re.fullmatch(r'/api/sales-orders/([\w-]+)', path):
+                return 200, server.make_sales_order(match.group(1))
+
+        if method == 'POST':
+            if path == '/api/jobs/list':
+                # Page through the jobs that match the requested status, like the real API does with take/skip
+                query = parse_qs(url.query)
+                take = int(query.get('take', [100])[0])
+                skip = int(query.get('skip', [0])[0])
+                status = json.loads(body or b'{}').get('status')
+                job_ids = server.job_ids_by_status.get(status, []) if status else range(1, server.job_count + 1)
+                return 200, [{'id': job_id, 'modifiedUtc': server.modified.get(job_id, DEFAULT_MODIFIED)}
+                             for job_id in job_ids[skip:skip + take]]
+            if match := re.fullmatch(r'/api/jobs/(\d+)/operations/list', path):
+                return 200, server.make_operations(int(match.group(1)))
+
+        return 404, {'error': 'not found'}
+
+
+class FulcrumStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients close their connection early when they cancel prefetched pages, that is expected
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def shutdown(self):
+        super().shutdown()
+        self.server_close()
+        if self.recording is not None:
+            self.recording.close()
+
+    def make_job(self, job_id):
+        return make_job(job_id, self.job_statuses, self.modified.get(job_id, DEFAULT_MODIFIED),
+                        self.jobs_per_sales_order)
+
+    def make_sales_order(self, sales_order_id):
+        sales_order = make_sales_order(sales_order_id)
+        if sales_order_id in self.delivery_due_dates:
+            sales_order['deliveryDueDate'] = self.delivery_due_dates[sales_order_id]
+        return sales_order
+
+    def make_operations(self, job_id):
+        operations = make_operations(job_id, self.operations_per_job)
+        for item in operations:
+            status = self.operation_statuses.get((job_id, item['operation']['order']))
+            if status is not None:
+                item['operation']['status'] = status
+        return operations
+
+
+def start_stub_server(job_count=100, latency=0.02, port=0, job_statuses=('inProgress',), latency_jitter=0.0,
+                      error_rate=0.0, throttle_rate=0.0, operations_per_job=5, jobs_per_sales_order=3,
+                      record=None, replay=None, upstream=FULCRUM_API_URL):
+    # Start the server in a background thread and return it; server.base_url is the URL to give the client
+    # - latency (+ a random 0..latency_jitter) seconds are added to every call
+    # - error_rate / throttle_rate are the fractions of calls answered with 500 / 429 (with Retry-After)
+    # - the jobs take their status from job_statuses in turn, so several statuses can be listed in one run
+    # - record='calls.ndjson.gz' forwards every call to upstream and saves it, replay='calls.ndjson.gz' answers
+    #   from that file instead of the generated dataset
+    # Set server.modified[job_id] to a new timestamp to simulate a job that changed since the last run
+    # Set server.delivery_due_dates[sales_order_id] (e.g. 'so-0': '2024/12/31') to simulate a sales order whose
+    # delivery date moved, sales orders carry no modified timestamp
+    # Set server.operation_statuses[(job_id, step)] (e.g. (1, 1): 'complete') to simulate an operation that moved on
+    # without its job's modified timestamp changing
+    server = FulcrumStubServer(('127.0.0.1', port), FulcrumStubHandler)
+    server.job_count = job_count
+    server.job_statuses = job_statuses
+    server.operations_per_job = operations_per_job
+    server.jobs_per_sales_order = jobs_per_sales_order
+    server.modified = {}
+    server.delivery_due_dates = {}
+    server.operation_statuses = {}
+    server.latency = latency
+    server.latency_jitter = latency_jitter
+    server.error_rate = error_rate
+    server.throttle_rate = throttle_rate
+    server.upstream = upstream if record else None
+    server.recording = Recording(record) if record else Recording(replay).load() if replay else None
+
+    # The job list is paged many times, so the ids of every status are worked out once
+    server.job_ids_by_status = {}
+    for job_id in range(1, job_count + 1):
+        server.job_ids_by_status.setdefault(job_statuses[job_id % len(job_statuses)], []).append(job_id)
+
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Fulcrum API")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--jobs', type=int, default=1000, help="Number of generated jobs")
+    parser.add_argument('--operations-per-job', type=int, default=5)
+    parser.add_argument('--statuses', default='inProgress', help="Comma separated job statuses")
+    parser.add_argument('--latency', type=float, default=0.02, help="Seconds added to every call")
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help="Random extra seconds, up to this")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of calls answered with 500")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of calls answered with 429")
+    parser.add_argument('--record', help="Forward calls to the real API and save them to this .ndjson.gz file")
+    parser.add_argument('--replay', help="Answer calls from this .ndjson.gz recording")
+    parser.add_argument('--upstream', default=FULCRUM_API_URL, help="API forwarded to when recording")
+    args = parser.parse_args()
+
+    stub = start_stub_server(args.jobs, args.latency, args.port, tuple(args.statuses.split(',')), args.latency_jitter,
+                             args.error_rate, args.throttle_rate, args.operations_per_job, record=args.record,
+                             replay=args.replay, upstream=args.upstream)
+    print(f"Fulcrum stand-in listening on {stub.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.shutdown()
@@ -5,7 +5,7 @@ a = Analysis(
     ['gannt-chart.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('assets/logo_grey_full.png', 'assets')],
     hiddenimports=['plotly'],
     hookspath=[],
     hooksconfig={},
@@ -1,159 +1,291 @@
-import requests  # Used to extract data from api
+import asyncio  # Used to fetch the jobs concurrently
+import base64  # Used to inline the logo in the chart
+import functools  # Used to read the logo only once
+import os
+import sys
+import numpy as np  # Used to broadcast the job attributes to the operations
 import pandas as pd  # Pandas
 import plotly.express as px  # Used to graph the Gantt chart
 import plotly.graph_objects as go  # Used to plot the Gantt chart
 from datetime import datetime  # Used to extract date & time format from strings
 import pytz  # Adjust timezone when extracting today's date & time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
+from concurrent.futures import Future, ThreadPoolExecutor  # Used to pull the API data while the Excel file is read
+from fulcrum_client import (FulcrumClient, SalesOrderCache, FULCRUM_API_URL, DEFAULT_MAX_CONCURRENCY, DEFAULT_PAGE_SIZE,
+                            DEFAULT_RATE_LIMIT, fetch_json, run_graph, run_sync)
+from api_cache import ApiCache, DEFAULT_API_CACHE_PATH
+from stage_timer import StageTimer
+
+
+# Job statuses pulled from the API (a status name or a full /jobs/list filter payload)
+JOB_STATUSES = ["inProgress"]
+
+# Logo drawn on the chart, bundled in assets/ (a PyInstaller one-file build unpacks it under sys._MEIPASS)
+ASSETS_DIR = os.path.join(getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__))), 'assets')
+LOGO_PATH = os.path.join(ASSETS_DIR, 'logo_grey_full.png')
+
+# Jobs drawn on one page of the Gantt chart in the app, the most urgent (earliest Delivery Due Date) first
+GANTT_JOBS_PER_PAGE = 100
+
+# Background thread of start_api_pull, a second pull waits for the first one to finish
+API_PULL_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fulcrum-api')
+
+# Columns of the API dataframe: job and sales order attributes (stored once per job), then operation attributes
+API_JOB_COLUMNS = ['Job', 'job_salesOrderId', 'Date Created', 'Job Est. Completion', 'Sales Order', 'Delivery Due Date']
+API_OPERATION_COLUMNS = ['Job Item', 'Job Item Description', 'Status', 'Step', 'Actual Start', 'Instructions',
+                         'Actual End', 'Operation']
+
+# Timezone of the plant, every datetime column of the Gantt frame is timezone-aware datetime64 in this timezone
+GANTT_TIMEZONE = 'Asia/Kuala_Lumpur'
+
+# Datetime columns of the processed Gantt frame, typed once when the data comes in and only turned into
+# strings for display (hover texts)
+GANTT_DATETIME_COLUMNS = ['Date Created', 'Delivery Due Date', 'Production Due Date', 'Job Est. Completion',
+                          'Actual Start', 'Actual End', 'Scheduled Start', 'Scheduled End', 'Start', 'End']
+
+# How the API sends each datetime column: (format, utc)
+# The *Utc fields are ISO 8601 in UTC, the sales order delivery due date is a plain local date
+API_DATETIME_FORMATS = {
+    'Date Created': ('ISO8601', True),
+    'Job Est. Completion': ('ISO8601', True),
+    'Delivery Due Date': ('%Y/%m/%d', False),
+    'Actual Start': ('ISO8601', True),
+    'Actual End': ('ISO8601', True),
+}
+
+
+def extract_job_data(job_data, sales_data):
+    # List to extract certain data from the json file ( Can be found under response sample in the api info website)
+    return {
+        'Job': job_data['name'],
+        #'job_status': job_data['status'],
+        'job_salesOrderId': job_data['salesOrderId'],
+        'Date Created': job_data['createdUtc'],
+        'Job Est. Completion': job_data['scheduledEndUtc'],
+        #'sales_id': sales_data['id'],
+        'Sales Order': sales_data.get('number'),
+        #'sales_orderedDate': sales_data['orderedDate'],
+        'Delivery Due Date': sales_data.get('deliveryDueDate')
+    }
 
-def extract_data_from_api():
-    # API URLs needed
-    all_jobs_list_url_template = 'https://api.fulcrumpro.com/api/jobs/list'  # URL used to extract job Ids
-    operations_url_template = 'https://api.fulcrumpro.com/api/jobs/{jobId}/operations/list'  # URL used to extract operations provided the jobId
-    job_list_url_template = 'https://api.fulcrumpro.com/api/jobs/{jobId}'  # URL to extract info related to a job provided the jobId
-    sales_list_url_template = 'https://api.fulcrumpro.com/api/sales-orders/{salesOrderId}'  # URL to extract sale info provided the jobId
 
-    # Header that provides authentication and content type
-    headers_all_jobs_list = {
-        # Authorization key (very important, share with authorized people only)
-        'Authorization': 'Bearer authorization key here',
-        'Content-Type': 'application/json-patch+json'
+def extract_operation_columns(operations_data):
+    # Extract the operation data column by column (one list per column) instead of one dict per operation
+    # ( Refer to response sample in https://developers.fulcrumpro.com/api-schema#tag/Job-Operation)
+    items = [item['itemToMake']['itemReference'] for item in operations_data]
+    operations = [item['operation'] for item in operations_data]
+    return {
+        'Job Item': [item['number'] for item in items],
+        'Job Item Description': [item['description'] for item in items],
+        'Status': [operation['status'] for operation in operations],
+        'Step': [operation['order'] for operation in operations],
+        'Actual Start': [operation['scheduledStartUtc'] for operation in operations],
+        'Instructions': [operation['instructions'] for operation in operations],
+        'Actual End': [operation['completedOnUtc'] for operation in operations],
+        'Operation': [operation['name'] for operation in operations],
     }
 
-    # Header that provides authentication and content type
-    headers = {
-        # Authorization key (very important, share with authorized people only)
-        'Authorization': 'Bearer authorization key here',
-        'Content-Type': 'application/json'
-    }
 
-    # Empty list to store data
-    all_data = []
-
-    # Function to extract all job ids
-    def get_all_job_ids(status, take, skip):
-        url = f"{all_jobs_list_url_template}?take={take}&skip={skip}"
-        # Filters job ids extracted according to status (Note : when left empty api doesn't extract all jobs)
-        payload = {"status": status}
-
-        # Make a POST request from api URl, provide authorization in headers
-        response = requests.post(all_jobs_list_url_template, headers=headers_all_jobs_list, json=payload)
-        if response.status_code == 200:  # status_code = 200 means extraction was successful
-            jobs_data = response.json()
-            job_ids = [job['id'] for job in jobs_data]
-            return job_ids
-        else:
-            print(f"Failed to get job list with status code {response.status_code}")
-            return []
-
-    # Call the function and store job ids in job_ids list
-    job_ids = get_all_job_ids("inProgress", 100, 0)
-
-    # Function to extract data using the jobId extracted
-    def fetch_data(jobId):
-        try:
-            job_url = job_list_url_template.format(jobId=jobId)  # Assign the jobId to the job_list_url
-            print(f"Processing Job ID : {jobId}")
-            response1 = requests.get(job_url, headers=headers)  # Make a GET request from the API
-            print(f"Response status code : {response1.status_code}")
-            if response1.status_code != 200:
-                return []
-
-            # Store the data extracted in json format in job_data list
-            job_data = response1.json()
-            # List to extract certain data from the json file ( Can be found under response sample in the api info website)
-            job_data = {
-                'Job': job_data['name'],
-                #'job_status': job_data['status'],
-                'job_salesOrderId': job_data['salesOrderId'],
-                'Date Created': job_data['createdUtc'],
-                'Job Est. Completion': job_data['scheduledEndUtc']
-            }
-
-            sales_url = sales_list_url_template.format(
-                salesOrderId=job_data['job_salesOrderId'])  # Assign the jobId to the sales_list_url
-            print(f"Processing Sales Order ID: {jobId}")
-            response2 = requests.get(sales_url, headers=headers)  # Make a GET request from the API
-            print(f"Response status code : {response2.status_code}")
-            if response2.status_code != 200:
-                return []
-
-            # Store the data extracted in json format in sales_data list
-            sales_data = response2.json()
-            # List to extract certain data from the json file ( Can be found under response sample in the api info website)
-            sales_data = {
-                #'sales_id': sales_data['id'],
-                'Sales Order': sales_data['number'],
-                #'sales_orderedDate': sales_data['orderedDate'],
-                'Delivery Due Date': sales_data['deliveryDueDate']
-            }
-
-            operations_url = operations_url_template.format(jobId=jobId)  # Assign the jobId to the operation_url
-            print(f"Processing Operations Order ID: {jobId}")
-            response3 = requests.post(operations_url, headers=headers)  # Make a POST request from the API
-            print(f"Response status code : {response3.status_code}")
-            if response3.status_code != 200:
-                return []
-
-            # Store the data extracted in json format in operations_data list
-            operations_data = response3.json()
-
-            # Make an empty list to store extracted data and flatten it
-            flattened_data = []
-
-            # Loop to extract data categories from operations_data ( Refer to response sample in https://developers.fulcrumpro.com/api-schema#tag/Job-Operation)
-            for item in operations_data:
-                itemToMake = item['itemToMake']
-                operation = item['operation']
-
-                item_to_make_data = {
-                    'Job Item': itemToMake['itemReference']['number'],
-                    'Job Item Description': itemToMake['itemReference']['description']
-                }
-
-                # Extract operation data
-                operation_data = {
-                    'Status': operation['status'],
-                    'Step': operation['order'],
-                    'Actual Start': operation['scheduledStartUtc'],
-                    'Instructions': operation['instructions'],
-                    'Actual End': operation['completedOnUtc'],
-                    'Operation': operation['name'],
-                }
-
-                # Combine all data extracted into one list
-                combined_data = {**job_data, **sales_data, **item_to_make_data, **operation_data}
-
-                # Add contents from combined_data to flattened_data
-                flattened_data.append(combined_data)
-
-            return flattened_data
-
-        except Exception as e:
-            print(f"An error occurred while processing job ID {jobId}: {e}")
-            return []
-
-    # Create a ThreadPoolExecutor to manage a pool of threads, allowing up to 20 threads to run concurrently
-    with ThreadPoolExecutor(max_workers=50) as executor:
-        # Submit tasks to the executor for each jobId in the job_ids list
-        futures = [executor.submit(fetch_data, jobId) for jobId in job_ids]
-
-        # Iterate over the futures as they complete, allowing you to handle each result as soon as it's ready
-        for future in as_completed(futures):
-
-            # Retrieve the result from the future object (the output of fetch_data)
-            result = future.result()
-
-            # Check if the result is not empty (or None); if it has valid data, extend the all_data list with the result
-            if result:
-                all_data.extend(result)
-
-    # Store data into a dataframe from all_data list
-    df = pd.DataFrame(all_data)
-
-    # Convert Job from string format to numeric format
-    df['Job'] = pd.to_numeric(df['Job'], errors='coerce')
+def to_gantt_datetime(series, format=None, utc=False, dayfirst=False):
+    # Parse a column into datetime64 in GANTT_TIMEZONE, invalid values become NaT
+    # Columns that already are datetime64 are not parsed again; naive values are local times (Excel exports)
+    # and are localized, aware values (the API's UTC fields) are converted
+    # With a format, the values in another shape (e.g. '2024-05-01' or a date with a time for '%Y/%m/%d') are
+    # parsed again each with its own shape, and the values that still are not dates are reported
+    # dayfirst=True reads ambiguous dates as day first (the Excel exports write 03/04/2024 for 3 April)
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        parsed = pd.to_datetime(series, format=format, utc=utc, dayfirst=dayfirst, errors='coerce')
+        failed = parsed.isna() & series.notna()
+        if format is not None and failed.any():
+            retried = pd.to_datetime(series[failed], format='mixed', utc=True, dayfirst=dayfirst, errors='coerce')
+            # utc=True reads every value, naive or not; naive columns keep the wall time
+            parsed[failed] = retried if utc else retried.dt.tz_localize(None)
+            failed &= parsed.isna()
+            if failed.any():
+                print(f"{failed.sum()} values of {series.name} could not be read as dates")
+        series = parsed
+    if series.dt.tz is None:
+        return series.dt.tz_localize(GANTT_TIMEZONE, nonexistent='shift_forward', ambiguous='NaT')
+    return series.dt.tz_convert(GANTT_TIMEZONE)
+
+
+# Style of a job depending on if it's late or not: (legend label of the job bar, bar color, delivery marker color)
+JOB_SITUATION_STYLES = {
+    # Job Est. Completion is later than the Delivery Due Date
+    'late': ('Late', 'rgba(235, 189, 189, 0.8)', 'darkred'),
+    'on_time': ('On Time', 'rgba(189, 255, 190, 0.8)', 'green'),
+    # Job Est. Completion or Delivery Due Date is missing: the bar is drawn as on time, with a grey marker
+    'missing_dates': ('On Time', 'rgba(189, 255, 190, 0.8)', 'grey'),
+}
+
+# Style of an operation depending on its status: (marker color, line color)
+OPERATION_STATUS_STYLES = {
+    'Paused': ('grey', 'rgba(61, 61, 61, 0.5)'),
+    'complete': ('blue', 'rgba(89, 136, 255, 0.5)'),
+    'Pending': ('purple', 'rgba(128, 0, 128, 0.5)'),
+    'Ready': ('cyan', 'rgba(141, 228, 255, 0.5)'),
+    'Running': ('yellowgreen', 'rgba(80, 247, 0, 0.7)'),
+}
+# Style of any other status
+OTHER_STATUS_STYLE = ('black', 'black')
+
+# Outsourced operations are drawn with this style whatever their status
+OUTSOURCED_STYLE = ('orange', 'rgba(255, 87, 51, 0.5)')
+# Operations that get the outsourced marker color, and the ones that get the outsourced line color
+OUTSOURCED_MARKER_OPERATIONS = ['Threading and Surface Coating', 'Threading', 'Surface Coating']
+OUTSOURCED_LINE_OPERATIONS = OUTSOURCED_MARKER_OPERATIONS + ['Induction Hardening', 'Xylan']
+
+
+def job_bar_colors():
+    # Legend label -> bar color of the job bars, taken from JOB_SITUATION_STYLES
+    return {label: bar_color for label, bar_color, _ in JOB_SITUATION_STYLES.values()}
+
+
+def add_status_styles(df):
+    # Add 'Job Situation', 'job_color', 'operation_status_color' and 'operation_line_color' with vectorized
+    # lookups into the style tables above (no Python code runs per row)
+    estimated = df['Job Est. Completion']
+    due = df['Delivery Due Date']
+    has_dates = (estimated.notna() & due.notna()).to_numpy()
+    is_late = has_dates & (estimated > due).to_numpy()
+    situation = pd.Series(np.select([is_late, has_dates], ['late', 'on_time'], 'missing_dates'), index=df.index)
+    df['Job Situation'] = situation.map({key: style[0] for key, style in JOB_SITUATION_STYLES.items()})
+    df['job_color'] = situation.map({key: style[2] for key, style in JOB_SITUATION_STYLES.items()})
+
+    status = df['Status']
+    operation = df['Operation']
+    marker_colors = status.map({key: style[0] for key, style in OPERATION_STATUS_STYLES.items()})
+    line_colors = status.map({key: style[1] for key, style in OPERATION_STATUS_STYLES.items()})
+    df['operation_status_color'] = marker_colors.where(~operation.isin(OUTSOURCED_MARKER_OPERATIONS),
+                                                       OUTSOURCED_STYLE[0]).fillna(OTHER_STATUS_STYLE[0])
+    df['operation_line_color'] = line_colors.where(~operation.isin(OUTSOURCED_LINE_OPERATIONS),
+                                                   OUTSOURCED_STYLE[1]).fillna(OTHER_STATUS_STYLE[1])
+    return df
+
+
+class ApiFrameBuilder:
+    # Collects the API data in column buffers (one list per field) instead of a dict per operation
+    # Job and sales order attributes are stored once per job and only broadcast to the operations in build()
+
+    def __init__(self):
+        self.jobs = {column: [] for column in API_JOB_COLUMNS}
+        self.operations = {column: [] for column in API_OPERATION_COLUMNS}
+        # Position in self.jobs of the job each operation belongs to
+        self.job_positions = []
+
+    def add_job(self, job_data, operation_columns):
+        position = len(self.jobs['Job'])
+        for column in API_JOB_COLUMNS:
+            self.jobs[column].append(job_data[column])
+        for column in API_OPERATION_COLUMNS:
+            self.operations[column].extend(operation_columns[column])
+        self.job_positions.extend([position] * len(operation_columns['Status']))
+
+    def build(self):
+        df_jobs = pd.DataFrame(self.jobs, columns=API_JOB_COLUMNS)
+
+        # Convert Job from string format to numeric format (once per job rather than once per operation)
+        df_jobs['Job'] = pd.to_numeric(df_jobs['Job'], errors='coerce')
+
+        # Parse the dates once, with their known format: the job dates once per job, the operation dates here
+        df_operations = pd.DataFrame(self.operations, columns=API_OPERATION_COLUMNS)
+        for frame in (df_jobs, df_operations):
+            for column in frame.columns.intersection(list(API_DATETIME_FORMATS)):
+                frame[column] = to_gantt_datetime(frame[column], *API_DATETIME_FORMATS[column])
+
+        # Broadcast the job attributes to the operations with one positional take per column
+        # (.array keeps the timezone of the datetime columns)
+        positions = np.asarray(self.job_positions, dtype=np.intp)
+        columns = {column: df_jobs[column].array.take(positions) for column in API_JOB_COLUMNS}
+        columns.update({column: df_operations[column].array for column in API_OPERATION_COLUMNS})
+        return pd.DataFrame(columns, columns=API_JOB_COLUMNS + API_OPERATION_COLUMNS)
+
+
+def extract_data_from_api(base_url=FULCRUM_API_URL, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                          statuses=None, page_size=DEFAULT_PAGE_SIZE, cache_path=DEFAULT_API_CACHE_PATH,
+                          rate_limit=DEFAULT_RATE_LIMIT):
+    # Sync wrapper so process_df (and the Tk handlers) can keep calling this like a normal function
+    return run_sync(extract_data_from_api_async, base_url, max_concurrency, statuses, page_size, cache_path,
+                    rate_limit)
+
+
+async def extract_data_from_api_async(base_url=FULCRUM_API_URL, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                                      statuses=None, page_size=DEFAULT_PAGE_SIZE, cache_path=DEFAULT_API_CACHE_PATH,
+                                      rate_limit=DEFAULT_RATE_LIMIT):
+    # Pull every page of every status, e.g. statuses=["inProgress", "scheduled", {"status": "complete", ...}]
+    statuses = statuses or JOB_STATUSES
+
+    # Responses from earlier runs are kept on disk, so only jobs that changed are downloaded again
+    # (cache_path=None pulls everything from the API)
+    api_cache = ApiCache(cache_path) if cache_path else None
+
+    # Columns to store data, filled job by job
+    api_frame = ApiFrameBuilder()
+
+    try:
+        # One client (and one pool of keep-alive connections) is shared by every API call in this run
+        async with FulcrumClient(base_url, max_concurrency=max_concurrency, cache=api_cache,
+                                 rate_limit=rate_limit) as client:
+            # Sales orders are shared by many jobs, so each one is downloaded once per run
+            sales_orders = SalesOrderCache(client)
+
+            # Nodes that could not be fetched, as (jobId, node, reason), reported at the end of the run
+            failed_nodes = []
+
+            # Function to extract data using the jobId extracted
+            async def fetch_data(jobId):
+                try:
+                    print(f"Processing Job ID : {jobId}")
+                    # The operations list only needs the jobId, so it is requested at the same time as the job;
+                    # only the sales order waits for the job, because it needs the job's salesOrderId
+                    results, errors = await run_graph({
+                        'job': ((), lambda: fetch_json(client.get_job(jobId))),
+                        'sales order': (('job',), lambda job: fetch_json(sales_orders.get(job['salesOrderId']))),
+                        'operations': ((), lambda: fetch_json(client.list_operations(jobId))),
+                    })
+                    for node, error in errors.items():
+                        print(f"Failed to get the {node} of job ID {jobId}: {error}")
+                        failed_nodes.append((jobId, node, str(error)))
+
+                    # Without the job or its operations there is nothing to draw
+                    if 'job' not in results or 'operations' not in results:
+                        return None
+
+                    # When only the sales order failed, the operations are kept with empty sales order columns
+                    job_data = extract_job_data(results['job'], results.get('sales order', {}))
+                    return job_data, extract_operation_columns(results['operations'])
+
+                except Exception as e:
+                    print(f"An error occurred while processing job ID {jobId}: {e}")
+                    return None
+
+            # Schedule fetch_data for every jobId as soon as its page of the job list arrives, so the jobs are
+            # fetched while the rest of the list is still being enumerated
+            # The client's concurrency limit decides how many calls run at the same time
+            tasks = []
+            async for jobId in client.iter_job_ids(statuses, page_size):
+                tasks.append(asyncio.create_task(fetch_data(jobId)))
+
+            # Iterate over the tasks as they complete, allowing you to handle each result as soon as it's ready
+            for task in asyncio.as_completed(tasks):
+
+                # Retrieve the result from the task (the output of fetch_data)
+                result = await task
+
+                # Check if the result is not None; if it has valid data, add the job and its operations to the frame
+                if result is not None:
+                    api_frame.add_job(*result)
+
+            print(sales_orders.report())
+            if failed_nodes:
+                print(f"{len(failed_nodes)} API calls failed for {len({jobId for jobId, _, _ in failed_nodes})} jobs")
+            print(client.scheduler.stats.report())
+    finally:
+        if api_cache is not None:
+            print(api_cache.report())
+            api_cache.close()
+
+    # Store data into a dataframe from the collected columns
+    df = api_frame.build()
 
     # Sort values in the dataframe according to sales_deliveryDueDate in ascending order
     df = df.sort_values(by='Delivery Due Date', ascending=True)
@@ -161,41 +293,80 @@ def extract_data_from_api():
     return df
 
 
-def process_df(df_job, df_op):
-    # Extract data from the api and store it in dataframe
-    df_api = extract_data_from_api()
+# Columns of the Gantt Excel export used by process_df, only these are read (see workbook_loader.read_sheets)
+GANTT_JOB_SHEET_COLUMNS = ['Job', 'Status', 'Date Created', 'Delivery Due Date', 'Make Item']
+GANTT_OPERATION_SHEET_COLUMNS = ['Job', 'Step', 'Operation', 'Status', 'Sales Order', 'Scheduled Start',
+                                 'Scheduled End', 'Job Item', 'Job Item Description', 'Quantity Completed',
+                                 'Customer', 'Production Due Date', 'Planned Quantity']
+GANTT_SHEETS = {
+    'Latest Job Activity': (GANTT_JOB_SHEET_COLUMNS, None),
+    'Open Operations': (GANTT_OPERATION_SHEET_COLUMNS, {'Quantity Completed': 'float64',
+                                                        'Planned Quantity': 'float64'}),
+}
 
-    # Create a copy of the dataframe
-    df_api_copy = df_api.copy()
-    # Filter the DataFrame to include only rows where the status is 'complete'
-    df_api_copy = df_api_copy[df_api_copy["Status"] == 'complete']
-    # Drop unnecessary columns that are no longer required for further analysis or processing
-    df_api_copy = df_api_copy.drop(columns=['job_salesOrderId'])
+# Job-level attributes that are only known on some rows of a job (API rows or Excel rows)
+JOB_FILL_COLUMNS = ['Date Created', 'Delivery Due Date', 'Make Item', 'Customer', 'Production Due Date',
+                    'Planned Quantity', 'Job Est. Completion', 'Job Status']
+
+
+def fill_job_columns(df_combined):
+    # Forward then backward fill JOB_FILL_COLUMNS within each 'Job' group, using the built-in grouped
+    # ffill/bfill over all the columns at once instead of a Python lambda per column and group
+    # Rows without a 'Job' are left empty, like groupby().transform() does
+    job = df_combined['Job']
+    filled = df_combined.groupby(job)[JOB_FILL_COLUMNS].ffill()
+    filled = filled.groupby(job).bfill()
+    df_combined[JOB_FILL_COLUMNS] = filled.infer_objects(copy=False)
+    return df_combined
 
-    # Convert the 'Actual Start' column to datetime format, coercing errors (invalid parsing will result in NaT)
-    df_api_copy['Actual Start'] = pd.to_datetime(df_api_copy['Actual Start'], errors='coerce')
-    # Format the 'Actual Start' datetime values into a string with the format 'DD/MM/YYYY HH:MM:SS'
-    df_api_copy['Actual Start'] = df_api_copy['Actual Start'].dt.strftime('%d/%m/%Y %H:%M:%S')
 
-    # Convert the 'Actual End' column to datetime format, coercing errors (invalid parsing will result in NaT)
-    df_api_copy['Actual End'] = pd.to_datetime(df_api_copy['Actual End'], errors='coerce')
-    # Format the 'Actual End' datetime values into a string with the format 'DD/MM/YYYY HH:MM:SS'
-    df_api_copy['Actual End'] = df_api_copy['Actual End'].dt.strftime('%d/%m/%Y %H:%M:%S')
+def start_api_pull(timer=None, **kwargs):
+    # Start extract_data_from_api in the background and return a Future of its dataframe, so the API pull runs
+    # while the user picks the Excel file and the workbook is read; pass the Future to process_df
+    # kwargs are passed on to extract_data_from_api (base_url, statuses, cache_path, ...)
+    timer = timer or StageTimer()
 
-    # Convert the 'Deliver Due Date' column to datetime format, coercing errors (invalid parsing will result in NaT)
-    df_api_copy['Delivery Due Date'] = pd.to_datetime(df_api_copy['Delivery Due Date'], errors='coerce')
+    def pull():
+        with timer.stage('API pull (background)'):
+            return extract_data_from_api(**kwargs)
 
+    return API_PULL_EXECUTOR.submit(pull)
+
+
+def process_df(df_job, df_op, df_api=None, timer=None):
+    # df_api is the API dataframe, a Future from start_api_pull, or None to pull it from the API now
+    # timer (a StageTimer) records how long each stage took
+    timer = timer or StageTimer()
+
+    # The Excel part does not need the API data, so it runs first while a background pull is still going
+    with timer.stage('Prepare Excel'):
+        df_excel = prepare_excel_frame(df_job, df_op)
+
+    # Extract data from the api and store it in dataframe (or wait for the background pull to finish)
+    with timer.stage('Wait for API'):
+        if df_api is None:
+            df_api = extract_data_from_api()
+        elif isinstance(df_api, Future):
+            df_api = df_api.result()
+
+    with timer.stage('Merge'):
+        return merge_gantt_frames(df_api, df_excel)
+
+
+def prepare_excel_frame(df_job, df_op):
     # Make a copy of the operation dataframe
     df_op_copy = df_op.copy()
     # Make a copy of the job dataframe
     df_job_copy = df_job.copy()
     # Drop unnecessary columns that are no longer required for further analysis or processing
+    # (errors='ignore': a sheet read with GANTT_SHEETS does not have them in the first place)
     df_op_copy = df_op_copy.drop(columns=['Customer PO', 'Planned Setup Hours',
                                           'Actual Setup Hours', 'Planned Labor Hours',
                                           'Actual Labor Hours', 'Planned Machine Hours',
                                           'Actual Machine Hours', 'Ready To Collect From Previous Operation',
                                           'Quantity Collected From Previous Operation',
-                                          'Scheduled Department', 'Scheduled Equipment', 'Scheduled Work Center'])
+                                          'Scheduled Department', 'Scheduled Equipment', 'Scheduled Work Center'],
+                                 errors='ignore')
     # Change the name of the status column
     df_job_copy['Job Status'] = df_job_copy['Status']
     # Drop unnecessary columns that are no longer required for further analysis or processing
@@ -204,10 +375,25 @@ def process_df(df_job, df_op):
                                             'Production Due Date',
                                             'Job Item Description', 'Planned Quantity', 'Quantity Completed',
                                             'Sales Order', 'Customer PO', 'Current Item Description', 'Log Type',
-                                            'Status'])
+                                            'Status'], errors='ignore')
+
+    # The Excel dates are local times, give them the same datetime64 type and timezone as the API dates
+    for frame in (df_op_copy, df_job_copy):
+        for column in frame.columns.intersection(GANTT_DATETIME_COLUMNS):
+            frame[column] = to_gantt_datetime(frame[column], dayfirst=True)
 
     # Merge operation dataframe with job dataframe
-    df_op_copy1 = pd.merge(df_op_copy, df_job_copy, on='Job', how='left')
+    return pd.merge(df_op_copy, df_job_copy, on='Job', how='left')
+
+
+def merge_gantt_frames(df_api, df_op_copy1):
+    # Create a copy of the dataframe
+    df_api_copy = df_api.copy()
+    # Filter the DataFrame to include only rows where the status is 'complete'
+    df_api_copy = df_api_copy[df_api_copy["Status"] == 'complete']
+    # Drop unnecessary columns that are no longer required for further analysis or processing
+    # (the API dates are already datetime64 in GANTT_TIMEZONE, see ApiFrameBuilder.build)
+    df_api_copy = df_api_copy.drop(columns=['job_salesOrderId'])
 
     # Concatenate the two DataFrames (df_api_copy and df_op_copy1) into one DataFrame and reset the index
     df_combined = pd.concat([df_api_copy, df_op_copy1], ignore_index=True)
@@ -216,35 +402,18 @@ def process_df(df_job, df_op):
     df_combined["Sales Order"] = df_combined["Sales Order"].astype(str).str.extract(r'(\d+)').astype(float)
     df_combined["Job"] = df_combined["Job"].astype(str).str.extract(r'(\d+)').astype(float)
 
+    # A job whose sales order could not be fetched from the API (see extract_data_from_api) takes it from the
+    # Excel rows of the same job, a job has a single sales order
+    df_combined["Sales Order"] = df_combined["Sales Order"].fillna(
+        df_combined.groupby("Job")["Sales Order"].transform('first'))
+
     # Sort the combined DataFrame by the "Job" column to ensure all data is ordered by job numbers
     df_combined = df_combined.sort_values(by="Job")
 
     # Enable future behavior for silent downcasting warnings globally in pandas
     pd.set_option('future.no_silent_downcasting', True)
-    # Forward and backward fill missing values for 'Date Created' within each 'Job' group
-    df_combined['Date Created'] = (df_combined.groupby('Job')['Date Created']
-                                   .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
-    # Forward and backward fill missing values for 'Delivery Due Date' within each 'Job' group
-    df_combined['Delivery Due Date'] = (df_combined.groupby('Job')['Delivery Due Date']
-                                        .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
-    # Forward and backward fill missing values for 'Make Item' within each 'Job' group
-    df_combined['Make Item'] = (df_combined.groupby('Job')['Make Item']
-                                .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
-    # Forward and backward fill missing values for 'Customer' within each 'Job' group
-    df_combined['Customer'] = (df_combined.groupby('Job')['Customer']
-                               .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
-    # Forward and backward fill missing values for 'Production Due Date' within each 'Job' group
-    df_combined['Production Due Date'] = (df_combined.groupby('Job')['Production Due Date']
-                                          .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
-    # Forward and backward fill missing values for 'Planned Quantity' within each 'Job' group
-    df_combined['Planned Quantity'] = (df_combined.groupby('Job')['Planned Quantity']
-                                       .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
-    # Forward and backward fill missing values for 'Job Est. Completion' within each 'Job' group
-    df_combined['Job Est. Completion'] = (df_combined.groupby('Job')['Job Est. Completion']
-                                          .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
-    # Forward and backward fill missing values for 'Job Status' within each 'Job' group
-    df_combined['Job Status'] = (df_combined.groupby('Job')['Job Status']
-                                 .transform(lambda x: x.ffill().bfill()).infer_objects(copy=False))
+    # Forward and backward fill missing job-level values within each 'Job' group, all columns in one pass
+    df_combined = fill_job_columns(df_combined)
 
     # Fill missing 'Quantity Completed' values with the 'Planned Quantity' value
     df_combined['Quantity Completed'] = df_combined['Quantity Completed'].fillna(df_combined['Planned Quantity'])
@@ -262,11 +431,14 @@ def process_df(df_job, df_op):
     # Replace any occurrences of 'nan' in the 'Qty' column with an empty string
     df_combined["Qty"] = df_combined["Qty"].str.replace('nan', '')
 
+    # Drop empty rows if a 'Sale Order' column is empty (jobs without a sales order in the API or the Excel file)
+    no_sales_order = df_combined['Sales Order'].isna()
+    if no_sales_order.any():
+        print(f"{df_combined.loc[no_sales_order, 'Job'].nunique()} jobs without a sales order are not drawn")
+    df_combined = df_combined[~no_sales_order].copy()
     # Combine 'Sales Order' and 'Job' as strings and create a new column 'SO/WO' # in the format 'Sale Order'/'Job'
     df_combined["SO/WO"] = "SO" + df_combined["Sales Order"].astype('Int64').astype(str) + "/" + "WO" + df_combined[
         "Job"].astype('Int64').astype(str)
-    # Drop empty rows if a 'Sale Order' column is empty
-    df_combined.dropna(subset=['Sales Order'], inplace=True)
     # Define the desired column order for the DataFrame
     desired_order = [
         'SO/WO',
@@ -297,89 +469,106 @@ def process_df(df_job, df_op):
     return df
 
 
-def generate_gantt_chart(df):
-    # Set the timezone to Asia/Kuala_Lumpur
-    timezone = pytz.timezone('Asia/Kuala_Lumpur')
-
-    # Sort the DataFrame by Delivery Due Date
-    sorted_so_wo = df.sort_values(by='Delivery Due Date')['SO/WO'].tolist()
-
-    # First, ensure all relevant columns are converted to datetime format
-    df['Date Created'] = pd.to_datetime(df['Date Created'], errors='coerce')
-    df['Delivery Due Date'] = pd.to_datetime(df['Delivery Due Date'], format='%Y/%m/%d', errors='coerce')
-    df['Job Est. Completion'] = pd.to_datetime(df['Job Est. Completion'], errors='coerce')
-    df['Start'] = pd.to_datetime(df['Start'], dayfirst=True, errors='coerce')
-    df['End'] = pd.to_datetime(df['End'], dayfirst=True, errors='coerce')
-
-    # Define a function to check tz-naive or tz-aware and localize/convert
-    def localize_or_convert_timezone(series, timezone):
-        if series.dt.tz is None:
-            return series.dt.tz_localize(timezone, nonexistent='shift_forward', ambiguous='NaT')
-        else:
-            return series.dt.tz_convert(timezone)
-
-    # Now safely apply the function to your columns
-    df['Date Created'] = localize_or_convert_timezone(df['Date Created'], 'Asia/Kuala_Lumpur')
-    df['Delivery Due Date'] = localize_or_convert_timezone(df['Delivery Due Date'], 'Asia/Kuala_Lumpur')
-    df['Job Est. Completion'] = localize_or_convert_timezone(df['Job Est. Completion'], 'Asia/Kuala_Lumpur')
-    df['Start'] = localize_or_convert_timezone(df['Start'], 'Asia/Kuala_Lumpur')
-    df['End'] = localize_or_convert_timezone(df['End'], 'Asia/Kuala_Lumpur')
-
-    # Dataframe to determine the color of the job depending on if it's late or not
-    # The color is stored as a string to be used later
-    df['Job Situation'] = df.apply(
-        # If the row Job Est. Completion and Delivery Due Date are not NA
-        # and if Job Est. Completion is later than sales _deliveryDueDate then color the timeline in darkred
-        lambda row: "Late" if pd.notna(row['Job Est. Completion'])
-                              and pd.notna(row['Delivery Due Date'])
-                              and row['Job Est. Completion'] > row['Delivery Due Date']
-
-        # Else if the row Job Est. Completion & Delivery Due Date are not NA then color timeline in green
-        else "On Time",  # Else color in grey
-
-        axis=1
-    )
+@functools.lru_cache(maxsize=None)
+def logo_data_uri(path=LOGO_PATH):
+    # Read the logo once per run and return it as a base64 data URI, shared by every figure
+    # Returns None (the chart is drawn without logo) when the file is missing
+    try:
+        with open(path, 'rb') as logo_file:
+            return 'data:image/png;base64,' + base64.b64encode(logo_file.read()).decode('ascii')
+    except OSError as e:
+        print(f"Could not read the logo {path}: {e}")
+        return None
+
+
+def generate_gantt_chart(df, batched=True, window_start=None, window_end=None, jobs_per_page=None, page=0):
+    # batched=True draws a handful of traces per color (fast), batched=False four traces per row
+    # window_start/window_end only draw the jobs whose span crosses that date window,
+    # jobs_per_page only draws one page of the jobs, the most urgent (earliest Delivery Due Date) first
+    # Returns the number of pages
+    df, page_count = select_gantt_jobs(df, window_start, window_end, jobs_per_page, page)
+    if page_count > 1:
+        print(f"Showing page {page + 1} of {page_count} ({df['SO/WO'].nunique()} jobs)")
+
+    fig = build_gantt_figure(df, batched)
+    if window_start is not None and window_end is not None:
+        # Open the chart on the chosen window
+        fig.update_xaxes(range=[to_gantt_timestamp(window_start), to_gantt_timestamp(window_end)])
+    fig.show()
+    return page_count
 
-    df['job_color'] = df.apply(
-        # If the row Job Est. Completion and Delivery Due Date are not NA
-        # and if Job Est. Completion is later than sales _deliveryDueDate then color the timeline in darkred
-        lambda row: "darkred" if pd.notna(row['Job Est. Completion'])
-                                 and pd.notna(row['Delivery Due Date'])
-                                 and row['Job Est. Completion'] > row['Delivery Due Date']
 
-        # Else if the row Job Est. Completion & Delivery Due Date are not NA then color timeline in green
-        else ("green" if pd.notna(row['Job Est. Completion'])
-                         and pd.notna(row['Delivery Due Date']) else 'grey'),  # Else color in grey
+def ensure_gantt_datetimes(df):
+    # The datetime columns already are datetime64 in GANTT_TIMEZONE when df comes from process_df,
+    # columns that are not (e.g. a frame loaded from elsewhere) are parsed here
+    for column in df.columns.intersection(GANTT_DATETIME_COLUMNS):
+        df[column] = to_gantt_datetime(df[column])
+    return df
 
-        axis=1
-    )
 
-    # Dataframe to identify the operation status (Running, Paused, complete, Pending & cancelled)
-    df['operation_status_color'] = df.apply(
-        lambda row: "orange" if row['Operation'] in ['Threading and Surface Coating', 'Threading', 'Surface Coating']
-        else "grey" if row['Status'] == 'Paused'
-        else "blue" if row['Status'] == 'complete'
-        else "purple" if row['Status'] == 'Pending'
-        else "cyan" if row['Status'] == 'Ready'
-        else "yellowgreen" if row['Status'] == 'Running'
-        else 'black',
-
-        axis=1
-    )
+def to_gantt_timestamp(value):
+    # A window bound (string, datetime or Timestamp) as a Timestamp in GANTT_TIMEZONE, naive values are local
+    timestamp = pd.Timestamp(value)
+    if timestamp.tz is None:
+        return timestamp.tz_localize(GANTT_TIMEZONE)
+    return timestamp.tz_convert(GANTT_TIMEZONE)
+
+
+def select_gantt_jobs(df, window_start=None, window_end=None, jobs_per_page=None, page=0):
+    # Keep the operation rows of the jobs to draw, returns (rows, number of pages)
+    # A job spans from its first date (Date Created or an operation start) to its last date (Delivery Due Date,
+    # Job Est. Completion or an operation end); jobs without any date are kept, like before windowing
+    if window_start is None and window_end is None and jobs_per_page is None:
+        return df, 1
+    df = ensure_gantt_datetimes(df.copy())
+
+    # One row per job: its span and its Delivery Due Date
+    jobs = pd.DataFrame({
+        'SO/WO': df['SO/WO'],
+        'span_start': df[['Date Created', 'Start']].min(axis=1),
+        'span_end': df[['Delivery Due Date', 'Job Est. Completion', 'End']].max(axis=1),
+        'due': df['Delivery Due Date'],
+    }).groupby('SO/WO', sort=False).agg(span_start=('span_start', 'min'), span_end=('span_end', 'max'),
+                                        due=('due', 'min'))
+
+    if window_start is not None:
+        jobs = jobs[jobs['span_end'].isna() | (jobs['span_end'] >= to_gantt_timestamp(window_start))]
+    if window_end is not None:
+        jobs = jobs[jobs['span_start'].isna() | (jobs['span_start'] <= to_gantt_timestamp(window_end))]
+
+    page_count = 1
+    if jobs_per_page is not None:
+        # Most urgent first, jobs without a Delivery Due Date last
+        jobs = jobs.sort_values(by='due', na_position='last', kind='stable')
+        page_count = max(1, -(-len(jobs) // jobs_per_page))
+        if not 0 <= page < page_count:
+            raise ValueError(f"Page {page + 1} does not exist, the Gantt chart has {page_count} page(s)")
+        jobs = jobs.iloc[page * jobs_per_page:(page + 1) * jobs_per_page]
+
+    return df[df['SO/WO'].isin(jobs.index)], page_count
+
+
+def job_bar_table(df):
+    # One row per job bar: every operation row of a job carries the same bar, so px.timeline only needs one
+    # (a job whose rows disagree on the bar dates keeps one bar per distinct span, as before)
+    bar_columns = ['SO/WO', 'Date Created', 'Max end date', 'Job Situation']
+    df_bars = df.drop_duplicates(subset=bar_columns)[bar_columns].copy()
+    # Number of operations of the job, shown when hovering over its bar
+    df_bars['Operations'] = df_bars['SO/WO'].map(df['SO/WO'].value_counts())
+    return df_bars
+
+
+def build_gantt_figure(df, batched=True):
+    # Set the timezone to Asia/Kuala_Lumpur
+    timezone = pytz.timezone(GANTT_TIMEZONE)
 
-    # Dataframe to have the line on job status in another opacity
-    df['operation_line_color'] = df.apply(
-        lambda row: "rgba(255, 87, 51, 0.5)" if row['Operation'] in ['Threading and Surface Coating', 'Threading',
-                                                                     'Surface Coating', 'Induction Hardening', 'Xylan']
-        else "rgba(61, 61, 61, 0.5)" if row['Status'] == 'Paused'
-        else "rgba(89, 136, 255, 0.5)" if row['Status'] == 'complete'
-        else "rgba(128, 0, 128, 0.5)" if row['Status'] == 'Pending'
-        else "rgba(141, 228, 255, 0.5)" if row['Status'] == 'Ready'
-        else "rgba(80, 247, 0, 0.7)" if row['Status'] == 'Running'
-        else 'black',
-
-        axis=1
-    )
+    df = ensure_gantt_datetimes(df)
+
+    # Sort the jobs by Delivery Due Date
+    sorted_so_wo = df.sort_values(by='Delivery Due Date', kind='stable')['SO/WO'].drop_duplicates().tolist()
+
+    # Lateness of each job and colors of each operation, looked up from the style tables
+    add_status_styles(df)
 
     # Create a new column for the maximum date
     df['Max end date'] = df[['Delivery Due Date', 'Job Est. Completion']].max(axis=1)
@@ -392,8 +581,8 @@ def generate_gantt_chart(df):
 
     # Create a plotly figure
     fig = px.timeline(
-        # Identify the dataframe we wish to use
-        df,
+        # Identify the dataframe we wish to use: one row per job, not one per operation
+        job_bar_table(df),
         # Assign the start on the x-axis
         x_start="Date Created",
         # Assign the end on the x-axis
@@ -402,13 +591,10 @@ def generate_gantt_chart(df):
         y="SO/WO",
         # Assign the color using dataframe column 'job_color' created earlier
         color='Job Situation',
-        color_discrete_map={
-            'Late': 'rgba(235, 189, 189, 0.8)',
-            'On Time': 'rgba(189, 255, 190, 0.8)'
-        },
+        color_discrete_map=job_bar_colors(),
         # Select the info we want when hovering over the timeline
         hover_data=[
-            "Operation"
+            "Operations"
         ],
         # Create a title
         title=f"Job Progress Timeline - {today}",
@@ -416,6 +602,56 @@ def generate_gantt_chart(df):
     )
 
     # Add markers for scheduled start and end dates
+    if batched:
+        add_batched_traces(fig, df)
+    else:
+        add_row_traces(fig, df)
+
+    # Add a logo to the top of the graph (inlined, so the chart opens without any network access)
+    logo = logo_data_uri()
+    if logo is not None:
+        fig.add_layout_image(
+            dict(
+                source=logo,
+                x=1.0,
+                y=1.15,
+                sizex=0.15,  # Width of the image (relative to the plot)
+                sizey=0.15,  # Height of the image (relative to the plot)
+                xanchor="center",
+                yanchor="top",
+                opacity=1,
+            )
+        )
+
+    # Add name at the very bottom
+    fig.update_layout(
+        annotations=[
+            go.layout.Annotation(
+                text="Ahmed Montasser",
+                xref="paper",
+                yref="paper",
+                x=1,
+                y=-0.1,
+                showarrow=False,
+                font=dict(size=12, color="black"),
+                align="right"
+            )
+        ]
+    )
+
+    fig.add_vline(x=today, line_width=2, line_dash="dash", line_color='red')
+
+    # Update y-axis order to follow Delivery Due Date order
+    fig.update_yaxes(categoryorder="array", categoryarray=sorted_so_wo[::-1])
+
+    # Update the layout to have the title 'Date' on the x-axis and 'Job Number' on y-axis
+    fig.update_layout(xaxis_title="Date", yaxis_title="Job Number")
+
+    return fig
+
+
+def add_row_traces(fig, df):
+    # Add markers for scheduled start and end dates, four traces for every row
     for _, row in df.iterrows():
         job_color = row['job_color']
         operation_status_color = row['operation_status_color']
@@ -471,42 +707,84 @@ def generate_gantt_chart(df):
             text=f"Production Due Date: {row['Production Due Date']},Job Number: {row['SO/WO']}"
         ))
 
-    # Add a logo to the top of the graph
-    fig.add_layout_image(
-        dict(
-            source="https://i.postimg.cc/4yLKW7PF/logo-grey-full.png",  # URL or path to your logo image
-            x=1.0,
-            y=1.15,
-            sizex=0.15,  # Width of the image (relative to the plot)
-            sizey=0.15,  # Height of the image (relative to the plot)
-            xanchor="center",
-            yanchor="top",
-            opacity=1,
-        )
-    )
-
-    # Add name at the very bottom
-    fig.update_layout(
-        annotations=[
-            go.layout.Annotation(
-                text="Ahmed Montasser",
-                xref="paper",
-                yref="paper",
-                x=1,
-                y=-0.1,
-                showarrow=False,
-                font=dict(size=12, color="black"),
-                align="right"
-            )
-        ]
-    )
-
-    fig.add_vline(x=today, line_width=2, line_dash="dash", line_color='red')
 
-    # Update y-axis order to follow Delivery Due Date order
-    fig.update_yaxes(categoryorder="array", categoryarray=sorted_so_wo[::-1])
+def interleave_segments(starts, ends):
+    # Return [start0, end0, None, start1, end1, None, ...] so many line segments can be drawn by one trace
+    values = np.empty(len(starts) * 3, dtype=object)
+    values[0::3] = starts
+    values[1::3] = ends
+    values[2::3] = None
+    return values
+
+
+def add_batched_traces(fig, df):
+    # Same markers and lines as add_row_traces, but one trace per marker type and color instead of four per row,
+    # so the number of traces depends on the number of colors and not on the number of rows
+    so_wo = df['SO/WO'].to_numpy(dtype=object)
+
+    # Hover texts built for every row at once
+    due_text = "Scheduled Due Date: " + df['Job Est. Completion'].astype(str)
+    operation_text = ("Operation: " + df['Operation'].astype(str) + "<br>"
+                      + "Start:" + df['Start'].astype(str) + ", End:" + df['End'].astype(str) + "<br>"
+                      + "Status:" + df['Status'].astype(str) + "<br>"
+                      + "Job Number: " + df['SO/WO'].astype(str))
+    created_text = ("Created: " + df['Date Created'].astype(str) + "<br>"
+                    + "Job Number: " + df['SO/WO'].astype(str) + "<br>"
+                    + "Item Number: " + df['Job Item'].astype(str) + "<br>"
+                    + "Item Description: " + df['Job Item Description'].astype(str))
+    delivery_text = ("Production Due Date: " + df['Production Due Date'].astype(str)
+                     + ",Job Number: " + df['SO/WO'].astype(str))
+
+    # Add marker for Scheduled Due Date
+    fig.add_trace(go.Scatter(
+        x=df['Job Est. Completion'].to_numpy(dtype=object),
+        y=so_wo,
+        mode='markers',
+        marker=dict(color='orange', size=15, symbol='circle'),
+        showlegend=False,
+        hoverinfo='text',
+        text=due_text.to_numpy()
+    ))
+
+    # Add line+markers for operation details, one trace per line/marker color pair
+    starts = df['Start'].to_numpy(dtype=object)
+    ends = df['End'].to_numpy(dtype=object)
+    operation_text = operation_text.to_numpy(dtype=object)
+    color_groups = df.groupby(['operation_line_color', 'operation_status_color'], sort=False).indices
+    for (operation_line_color, operation_status_color), positions in color_groups.items():
+        fig.add_trace(go.Scatter(
+            x=interleave_segments(starts[positions], ends[positions]),
+            y=interleave_segments(so_wo[positions], so_wo[positions]),
+            mode='lines+markers',
+            line=dict(color=operation_line_color, width=10),
+            marker=dict(color=operation_status_color, size=10),
+            showlegend=False,
+            hoverinfo='text',
+            text=interleave_segments(operation_text[positions], operation_text[positions])
+        ))
 
-    # Update the layout to have the title 'Date' on the x-axis and 'Job Number' on y-axis
-    fig.update_layout(xaxis_title="Date", yaxis_title="Job Number")
+    # Add marker for Date Created
+    fig.add_trace(go.Scatter(
+        x=df['Date Created'].to_numpy(dtype=object),
+        y=so_wo,
+        mode='markers',
+        marker=dict(color='purple', size=15, symbol='circle'),
+        showlegend=False,
+        hoverinfo='text',
+        text=created_text.to_numpy()
+    ))
+
+    # Add marker for Production Due Date, one trace per job color
+    delivery_dates = df['Delivery Due Date'].to_numpy(dtype=object)
+    delivery_text = delivery_text.to_numpy(dtype=object)
+    for job_color, positions in df.groupby('job_color', sort=False).indices.items():
+        fig.add_trace(go.Scatter(
+            x=delivery_dates[positions],
+            y=so_wo[positions],
+            mode='markers',
+            marker=dict(color=job_color, size=15, symbol='circle'),
+            showlegend=False,
+            hoverinfo='text',
+            text=delivery_text[positions]
+        ))
 
-    fig.show()
@@ -1,58 +1,102 @@
+import numpy as np
 import pandas as pd
-import datetime
 import plotly.express as px
-
-
-def extract_idle_data(df_copy):
+from pandas.tseries.api import guess_datetime_format  # Used to read every chunk's dates with one format
+from category_summary import dominant_category
+from clock_intervals import sweep_clock_intervals
+
+# Columns of the Time Management export used by the idle time reports, only these are read
+IDLE_COLUMNS = ['Job', 'Operation', 'Team Member', 'Clock Type', 'Started On Date', 'Started On Time',
+                'Started On Week', 'Stopped On Date', 'Stopped On Time', 'Labor Hours', 'Duration Hours']
+# Sheets read by the idle time buttons (the export has a single sheet), see workbook_loader.read_sheets
+IDLE_SHEETS = {0: (IDLE_COLUMNS, {'Duration Hours': 'float64'})}
+# Columns of the export kept after the row filters, until the report columns are added
+# (the clock times are held as the 'Started At' / 'Stopped At' timestamps, 'Started On Time' and
+# 'Stopped On Time' are only added back to the finished report)
+IDLE_DETAIL_COLUMNS = ['Job', 'Operation', 'Team Member', 'Started On Date', 'Started At', 'Started On Week',
+                       'Stopped On Date', 'Stopped At', 'Duration Hours']
+
+# Working hours of the day and night shifts, in minutes since midnight (07:45 - 18:15 and 19:45 - 06:15)
+DAY_START_MINUTE = 7 * 60 + 45
+DAY_END_MINUTE = 18 * 60 + 15
+NIGHT_START_MINUTE = 19 * 60 + 45
+NIGHT_END_MINUTE = 6 * 60 + 15
+DAY_SHIFT = (DAY_START_MINUTE, DAY_END_MINUTE)
+NIGHT_SHIFT = (NIGHT_START_MINUTE, NIGHT_END_MINUTE)
+
+# Hours a Team Member is expected to work on a day without and with overtime
+WORKING_HOURS = {'NO': 8.5, 'YES': 10.5}
+
+# You can store any special days here: the feedback of these days is the reason given
+SPECIAL_DAYS = {
+    'MUHAMMAD USAMA  KHAN': {
+        pd.to_datetime('2024-09-12 00:00:00'): '1/2 day',
+        pd.to_datetime('2024-09-10 00:00:00'): 'Medical Leave',
+        pd.to_datetime('2024-09-19 00:00:00'): 'Medical Leave'
+    },
+    'YEN KONG CHIN': {
+        pd.to_datetime('2024-09-11 00:00:00'): 'Medical Leave',
+    },
+}
+
+
+def clock_timestamps(dates, times):
+    # Timestamps of the dates at the clock times of the export ('07:45:00 AM'), NaT when either is missing or faulty
+    clock = pd.to_datetime(times, format='%I:%M:%S %p', errors='coerce')
+    return dates.dt.normalize() + (clock - clock.dt.normalize())
+
+
+def seconds_of_day(timestamps):
+    # Seconds since midnight of each timestamp, NaN for NaT
+    return (timestamps - timestamps.dt.normalize()) / pd.Timedelta(seconds=1)
+
+
+def parse_export_dates(dates, date_formats):
+    # Parse a date column of the export, invalid dates become NaT
+    # Dates written as text are all read with one format: it is guessed from the first text date of the export (as
+    # pd.to_datetime does for a whole column) and kept in date_formats, so every chunk reads 03/04/2024 the same way
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    if dates.name not in date_formats:
+        text = next((value for value in dates if isinstance(value, str)), None)
+        if text is None:
+            return pd.to_datetime(dates, errors='coerce')
+        date_formats[dates.name] = guess_datetime_format(text) or 'mixed'
+    return pd.to_datetime(dates, format=date_formats[dates.name], errors='coerce')
+
+
+def filter_idle_rows(df_copy, warnings, date_formats):
+    # Row filters of extract_idle_data, applied to one chunk of the export at a time
+    # Returns (kept rows, 'Duration Hours' summed per 'Team Member' & 'Started On Date'); warnings collects the
+    # warnings so each is printed once and not once per chunk, date_formats the date formats (see parse_export_dates)
     df_copy = df_copy[~df_copy['Clock Type'].str.contains('ClockIn')]
     df_copy = df_copy.dropna(subset=['Operation'], inplace=False)
     # Change the 'Started On Date' to datetime format
-    df_copy['Started On Date'] = pd.to_datetime(df_copy['Started On Date'], errors='coerce')
-    df_copy['Stopped On Date'] = pd.to_datetime(df_copy['Stopped On Date'], errors='coerce')
+    df_copy['Started On Date'] = parse_export_dates(df_copy['Started On Date'], date_formats)
+    df_copy['Stopped On Date'] = parse_export_dates(df_copy['Stopped On Date'], date_formats)
     if df_copy['Started On Date'].isna().any():
-        print("Warning: Some 'Started On Date' values could not be converted to datetime.")
+        warnings.add("Warning: Some 'Started On Date' values could not be converted to datetime.")
 
     # Ensure 'Labor Hours' is numeric
     df_copy['Labor Hours'] = pd.to_numeric(df_copy['Labor Hours'], errors='coerce')
     if df_copy['Labor Hours'].isna().any():
-        print("Warning: Some 'Labor Hours' values could not be converted to numeric.")
-
-    # Create a new column called 'Total Hours Per Day' group based on 'Team Member' & 'Started On Date' and sum up
-    # the 'Labor Hours'
-    # Unlike agg() or sum(), which would collapse the DataFrame into a smaller result, transform() returns a new series
-    # that has the same size as the original DataFrame.
-    # This means that for each row in df_copy, the value of Total Hours Per Day will be the same for all rows within
-    # the same group (i.e., for the same Team Member and Started On Date).
-    df_copy['Total Hours Per Day'] = df_copy.groupby(['Team Member', 'Started On Date'])['Duration Hours'].transform(
-        'sum')
-
-    # Create a new dataframe to group data for each unique combination of 'Started On Date' & 'Team Member'
-    # and then calculate the sum for 'Labor Hours'
-    df_total_hours = df_copy.groupby(['Started On Date', 'Team Member'])['Duration Hours'].sum().reset_index()
-
-    df_copy.merge(df_total_hours, how='left', on='Started On Date')
-    if df_copy is None:
-        print("Error: df_copy after merge is None")
-        return None
+        warnings.add("Warning: Some 'Labor Hours' values could not be converted to numeric.")
+
+    # Sum up the 'Duration Hours' of each 'Team Member' & 'Started On Date' (before the short clockings below are
+    # filtered out); extract_idle_data adds up the sums of every chunk into 'Total Hours Per Day'
+    day_hours = df_copy.groupby(['Team Member', 'Started On Date'])['Duration Hours'].sum()
 
     # Filter out data that have a Labor Time less than 1 minute
     df_copy = df_copy[df_copy['Duration Hours'] >= 0.01]
 
-    # Convert to datetime using (to_datetime) and then time format using (dt.time)
-    df_copy.loc[:, 'Started On Time'] = pd.to_datetime(df_copy['Started On Time'], format='%I:%M:%S %p',
-                                                       errors='coerce').dt.time
-    df_copy.loc[:, 'Stopped On Time'] = pd.to_datetime(df_copy['Stopped On Time'], format='%I:%M:%S %p',
-                                                       errors='coerce').dt.time
-
-    # Store working hours during the day and night shifts
-    day_start = datetime.datetime.strptime('07:45:00 am', '%I:%M:%S %p').time()
-    day_end = datetime.datetime.strptime('06:15:00 pm', '%I:%M:%S %p').time()
-    night_start = datetime.datetime.strptime('07:45:00 pm', '%I:%M:%S %p').time()
-    night_end = datetime.datetime.strptime('06:15:00 am', '%I:%M:%S %p').time()
-
-    # Store the value of working hours for overtime
-    normal_working_hours = 8.5
-    overtime_working_hours = 10.5
+    # Combine the dates and the times into 'Started At' and 'Stopped At' timestamps (datetime64, NaT when the time
+    # is faulty), so the clockings are real intervals the reports can do arithmetic on
+    df_copy['Started At'] = clock_timestamps(df_copy['Started On Date'], df_copy['Started On Time'])
+    # A clocking without a 'Stopped On Date' stops on the day it started
+    stopped_at = clock_timestamps(df_copy['Stopped On Date'].fillna(df_copy['Started On Date']),
+                                  df_copy['Stopped On Time'])
+    # A night shift clocking stopped after midnight on the day it started is rolled over to the next day
+    df_copy['Stopped At'] = stopped_at.mask(stopped_at < df_copy['Started At'], stopped_at + pd.Timedelta(days=1))
 
     # Specify the names that need to be excluded from the DataFrame
     names_to_exclude = ['AMIRUDDIN  BIN BIDEN  AMIR', 'Amalan  Arul Alphonse', 'Anand Chauhan',
@@ -71,110 +115,43 @@ def extract_idle_data(df_copy):
     # If you want to do the opposite, create names_to_include and delete '~' from this line
     df_copy = df_copy[~df_copy['Team Member'].isin(names_to_exclude)]
 
-    # Create a function to check whether the Team Member has worked overtime or not
-    def check_overtime(start_time, end_time):
-
-        # If data is NaN then it should be marked as "Faulty Data"
-        if pd.isna(start_time):
-            return 'FAULTY DATA'
-        if pd.isna(end_time):
-            return 'FAULTY DATA'
-
-        if night_end < start_time < day_start or night_end <= end_time <= day_start:
-            return 'YES'
-        elif day_end < start_time < night_start or day_end <= end_time:
-            return 'YES'
-        if day_start <= start_time <= day_end or day_start <= end_time <= day_end:
-            return 'NO'
-        elif night_start <= start_time <= night_end or night_start <= end_time <= night_end:
-            return 'NO'
-        else:
-            return 'FAULTY DATA'
-
-    # Function to mark all overtime rows of the same "Team Member" and "Started On Date" as "YES"
-    def apply_overtime(group):
-        group['Overtime'] = group.apply(lambda row: check_overtime(row['Started On Time'], row['Stopped On Time']),
-                                        axis=1)
-
-        # If any row has 'YES' for overtime, set all rows in this group to 'YES'
-        if 'YES' in group['Overtime'].values:
-            group['Overtime'] = 'YES'
-
-        return group
-
-    # Apply the (apply_overtime) function on df_copy
-    df_copy = df_copy.groupby(['Team Member', 'Started On Date']).apply(apply_overtime).reset_index(drop=True)
-
-    # Create a function to calculate the idle time
-    def calculate_idle_time(row):
-        overtime_status = row['Overtime']
-        total_hours = row['Total Hours Per Day']
-        if overtime_status == 'YES':
-            return overtime_working_hours - total_hours
-        elif overtime_status == 'NO':
-            return normal_working_hours - total_hours
-
-    # You can store any special days here
-    special_days = {
-        'MUHAMMAD USAMA  KHAN': {
-            pd.to_datetime('2024-09-12 00:00:00'): '1/2 day',
-            pd.to_datetime('2024-09-10 00:00:00'): 'Medical Leave',
-            pd.to_datetime('2024-09-19 00:00:00'): 'Medical Leave'
-        },
-        'YEN KONG CHIN': {
-            pd.to_datetime('2024-09-11 00:00:00'): 'Medical Leave',
-        },
-    }
-
-    # Create a function to get Feedback based on efficiency
-    def feedback(row):
-
-        if pd.isna(row['Started On Date']):
-            return 'Unkown'
-
-        efficiency = row['Idle Time Percentage']
-        team_member = row['Team Member']
-        started_on = row['Started On Date']
-
-        if isinstance(started_on, str):
-            try:
-                started_on = pd.to_datetime(started_on)
-            except ValueError:
-                return 'Unknown'
-
-        if team_member in special_days:
-            date_mapping = special_days[team_member]
-            if started_on in date_mapping:
-                return date_mapping[started_on]
-
-        if efficiency < -10:
-            return 'Left Time Running'
-        elif -10 < efficiency < 10:
-            return 'Good Time'
-        elif efficiency > 10:
-            return 'Too Much Idle Time'
-
-        return 'Unknown'
-
-    # Create a function to calculate the total time based on the overtime_status
-    def total_time(row):
-        overtime_status = row['Overtime']
-        if overtime_status == 'YES':
-            return 10.5
-        elif overtime_status == 'NO':
-            return 8.5
-
-    # Apply the (calculate_idle_time) function on a new column "Idle Hours"
-    df_copy.loc[:, 'Idle Hours'] = df_copy.apply(calculate_idle_time, axis=1)
-
-    # Apply the (total_time) function to a new column "Set Working Hours"
-    df_copy.loc[:, 'Set Working Hours'] = df_copy.apply(total_time, axis=1)
+    # Only the columns of the report are kept, so the rows held until the end take as little memory as possible
+    return df_copy[IDLE_DETAIL_COLUMNS], day_hours
 
-    # Calculate the Idle Time Percentage
-    df_copy['Idle Time Percentage'] = (df_copy['Idle Hours'] / df_copy['Set Working Hours']) * 100
 
-    # Create a new column and apply (feedback) function
-    df_copy.loc[:, 'Feedback'] = df_copy.apply(feedback, axis=1)
+def extract_idle_data(df_copy):
+    # df_copy is the Time Management export, as one DataFrame or as an iterable of DataFrame chunks
+    # (see workbook_loader.iter_sheet_chunks); chunks are filtered one at a time and only their kept rows and
+    # per member, per day sums are held, so the raw export (clock-ins, short clockings, unused columns) is never
+    # loaded whole
+    # The kept rows are the report itself (the 'Extensive Details' sheet lists every one of them), so they are all
+    # held until the end: memory grows with the number of kept rows, not with the chunk size
+    chunks = [df_copy] if isinstance(df_copy, pd.DataFrame) else df_copy
+    kept_rows = []
+    day_hours = None
+    warnings = set()
+    date_formats = {}
+    for chunk in chunks:
+        rows, chunk_day_hours = filter_idle_rows(chunk, warnings, date_formats)
+        kept_rows.append(rows)
+        # The same member and day can span two chunks, so the sums are added up rather than replaced
+        day_hours = chunk_day_hours if day_hours is None else day_hours.add(chunk_day_hours, fill_value=0)
+    for warning in sorted(warnings):
+        print(warning)
+    if not kept_rows:
+        print("Error: the Time Management export has no rows")
+        return None
+    df_copy = pd.concat(kept_rows, ignore_index=True)
+
+    # Create a new column called 'Total Hours Per Day': the same value for all rows of the same Team Member and
+    # Started On Date (rows without a Started On Date get NaN, like groupby().transform() gave them)
+    df_copy = df_copy.join(day_hours.rename('Total Hours Per Day'), on=['Team Member', 'Started On Date'])
+
+    # Mark whether each Team Member has worked overtime on each day
+    df_copy = mark_overtime(df_copy)
+
+    # Add the idle hours, working hours, idle time percentage and feedback of each row
+    df_copy = add_idle_columns(df_copy)
 
     # Round columns to 2 decimal places
     df_copy['Duration Hours'] = df_copy['Duration Hours'].round(decimals=2)
@@ -200,9 +177,15 @@ def extract_idle_data(df_copy):
         'Idle Hours',
         'Set Working Hours',
         'Idle Time Percentage',
-        'Feedback'
+        'Feedback',
+        'Started At',
+        'Stopped At'
     ]
 
+    # The report shows the clock times as times of day
+    df_copy['Started On Time'] = df_copy['Started At'].dt.time
+    df_copy['Stopped On Time'] = df_copy['Stopped At'].dt.time
+
     # Sort the values by Started On Date and Team Member name
     df_copy = df_copy.sort_values(by=['Started On Date', 'Team Member'], ascending=False)
 
@@ -213,10 +196,87 @@ def extract_idle_data(df_copy):
     return df_copy
 
 
+def mark_overtime(df_copy):
+    # Add the 'Overtime' column: 'YES' for every row of a Team Member and Started On Date when any of its rows
+    # starts or stops outside the shift, 'NO' for a row inside the day or night shift and 'FAULTY DATA' for a row
+    # with a missing or faulty time
+    # The times of day of 'Started At' and 'Stopped At' are compared as seconds since midnight against the shift
+    # bounds (in minutes, * 60), so a clocking at 18:15:30 is past 18:15 like it was when datetime.time objects were
+    # compared
+    start = seconds_of_day(df_copy['Started At'])
+    end = seconds_of_day(df_copy['Stopped At'])
+    day_start, day_end = DAY_START_MINUTE * 60, DAY_END_MINUTE * 60
+    night_start, night_end = NIGHT_START_MINUTE * 60, NIGHT_END_MINUTE * 60
+
+    # NaN compares False everywhere, the faulty rows are picked out first
+    faulty = start.isna() | end.isna()
+    # Started or stopped between the night shift end and the day shift start, or between the two shifts
+    overtime = (((night_end < start) & (start < day_start)) | ((night_end <= end) & (end <= day_start)) |
+                ((day_end < start) & (start < night_start)) | (day_end <= end))
+    # Started or stopped in the day shift, or in the night shift (the night shift wraps past midnight, so
+    # night_start <= time <= night_end never holds: kept as the reports have always computed it)
+    in_shift = (((day_start <= start) & (start <= day_end)) | ((day_start <= end) & (end <= day_end)) |
+                ((night_start <= start) & (start <= night_end)) | ((night_start <= end) & (end <= night_end)))
+    overtime = overtime & ~faulty
+
+    # Rows without a Team Member or Started On Date belong to no day and are dropped; the rows are ordered by
+    # Team Member and Started On Date, each day keeping the order of its rows
+    keys = ['Team Member', 'Started On Date']
+    kept = df_copy[keys].notna().all(axis=1)
+    df_copy = df_copy[kept].assign(Overtime=np.select([faulty[kept], overtime[kept], in_shift[kept]],
+                                                      ['FAULTY DATA', 'YES', 'NO'], 'FAULTY DATA'))
+    df_copy = df_copy.sort_values(keys, kind='stable')
+
+    # If any row of a day has 'YES' for overtime, set all rows of this day to 'YES'
+    day_overtime = overtime[df_copy.index].groupby([df_copy[key] for key in keys]).transform('any')
+    df_copy.loc[day_overtime, 'Overtime'] = 'YES'
+    return df_copy.reset_index(drop=True)
+
+
+def special_day_table(special_days):
+    # Flatten {Team Member: {date: reason}} into a 'Leave Reason' series indexed by (Team Member, Started On Date)
+    rows = [(team_member, pd.Timestamp(day), reason)
+            for team_member, days in special_days.items() for day, reason in days.items()]
+    table = pd.DataFrame(rows, columns=['Team Member', 'Started On Date', 'Leave Reason'])
+    table['Started On Date'] = table['Started On Date'].astype('datetime64[ns]')
+    return table.set_index(['Team Member', 'Started On Date'])['Leave Reason']
+
+
+def add_idle_columns(df_copy, special_days=SPECIAL_DAYS):
+    # Add 'Set Working Hours' (from the Overtime flag, NaN for faulty data), 'Idle Hours', 'Idle Time Percentage'
+    # and 'Feedback' to the mark_overtime output
+    df_copy = df_copy.copy()
+    df_copy['Set Working Hours'] = df_copy['Overtime'].map(WORKING_HOURS).astype('float64')
+    df_copy['Idle Hours'] = df_copy['Set Working Hours'] - df_copy['Total Hours Per Day']
+
+    # Calculate the Idle Time Percentage
+    df_copy['Idle Time Percentage'] = (df_copy['Idle Hours'] / df_copy['Set Working Hours']) * 100
+
+    # Feedback based on efficiency, unless the day is one of the special days of the Team Member
+    efficiency = df_copy['Idle Time Percentage']
+    leave_reason = df_copy.join(special_day_table(special_days),
+                                on=['Team Member', 'Started On Date'])['Leave Reason']
+    df_copy['Feedback'] = np.select(
+        [df_copy['Started On Date'].isna(), leave_reason.notna(),
+         efficiency < -10, (-10 < efficiency) & (efficiency < 10), efficiency > 10],
+        ['Unkown', leave_reason, 'Left Time Running', 'Good Time', 'Too Much Idle Time'],
+        'Unknown')
+    return df_copy
+
+
 def create_summary(df_copy, file_path):
     try:
         # Extract idle data from the original DataFrame and create a copy
         df_copy_1 = extract_idle_data(df_copy)
+    except Exception as e:
+        print(e)
+        return
+    write_idle_summary(df_copy_1, file_path)
+
+
+def write_idle_summary(df_copy_1, file_path):
+    # Write the summary workbook from the extract_idle_data output (df_copy_1 is not modified)
+    try:
         print(df_copy_1)
 
         # Create a new function to give feedback
@@ -240,38 +300,35 @@ def create_summary(df_copy, file_path):
             'Unknown': 'Unknown issue, needs investigation'
         }
 
-        # Create a function to get the Overall Feedback
-        def overall_feedback(group):
-            # Count the occurrences of each feedback
-            feedback_counts = group['Feedback'].value_counts()
-
-            # Find the most frequent feedback count
-            max_count = feedback_counts.max()
-
-            # Identify the dominant feedback(s) (if multiple have the same max count)
-            dominant_feedbacks = feedback_counts[feedback_counts == max_count].index.tolist()
-
-            # If there is more than one feedback with the same max count, return 'Needs investigation'
-            if len(dominant_feedbacks) > 1:
-                return "Needs Investigation"
-
-            # If only one dominant feedback, return the custom message for that feedback
-            dominant_feedback = dominant_feedbacks[0]
-            return feedback_messages.get(dominant_feedback, 'Mixed Feedback')
+        # Create a function to get the Overall Feedback of each Team Member: the message of their most frequent
+        # feedback, 'Needs Investigation' when several feedbacks share the highest count
+        def overall_feedback(df, name):
+            dominant = dominant_category(df, ['Team Member'], 'Feedback')
+            messages = dominant['Dominant'].map(feedback_messages).fillna('Mixed Feedback')
+            return pd.DataFrame({'Team Member': dominant['Team Member'],
+                                 name: np.where(dominant['Tied'], 'Needs Investigation', messages)})
 
         # Daily Summary for each Team Member ##
         # Create a new dataframe to store a summary each Team Members idle time for each day
         df_daily_feedback = df_copy_1.drop(
-            columns=['Started On Time', 'Stopped On Time', 'Duration Hours', 'Job', 'Operation', 'Stopped On Date'])
+            columns=['Started On Time', 'Stopped On Time', 'Duration Hours', 'Job', 'Operation', 'Stopped On Date',
+                     'Started At', 'Stopped At'])
 
-        feedback_data_daily = df_daily_feedback.groupby(['Team Member']).apply(
-            overall_feedback).reset_index(name='Daily Overall Feedback')
+        feedback_data_daily = overall_feedback(df_daily_feedback, 'Daily Overall Feedback')
 
         df_daily_feedback = pd.merge(df_daily_feedback, feedback_data_daily, on=['Team Member'],
                               how='left')
 
         # Drop the duplicates from the dataframe
         df_daily_feedback = df_daily_feedback.drop_duplicates()
+
+        # The actual idle gaps inside the shift windows and the overlapping clockings (see sweep_clock_intervals),
+        # in hours for each Team Member and day (a night shift counts on the day it started)
+        df_shifts, df_idle_gaps, df_overlaps = sweep_clock_intervals(df_copy_1, DAY_SHIFT, NIGHT_SHIFT)
+        shift_hours = (df_shifts.groupby(['Team Member', 'Shift Date'])[['Idle Gap Minutes', 'Overlap Minutes']]
+                       .sum() / 60).round(2)
+        shift_hours.columns = ['Idle Gap Hours', 'Overlapping Hours']
+        df_daily_feedback = df_daily_feedback.join(shift_hours, on=['Team Member', 'Started On Date'])
         #########################
 
         # Weekly Feedback for each Team Member ##
@@ -280,6 +337,8 @@ def create_summary(df_copy, file_path):
                                                      'Stopped On Time',
                                                      'Duration Hours',
                                                      'Overtime',
+                                                     'Started At',
+                                                     'Stopped At',
                                                      ])
 
         # Remove duplicate entries based on 'Team Member' and 'Started On Date' columns
@@ -304,8 +363,7 @@ def create_summary(df_copy, file_path):
         df_weekly_feedback.loc[:, 'Feedback'] = df_weekly_feedback.apply(feedback, axis=1)
 
         # Group by 'Team Member' and 'Started On Week' to calculate overall feedback
-        feedback_data_weekly = df_weekly_feedback.groupby(['Team Member']).apply(
-            overall_feedback).reset_index(name='Weekly Overall Feedback')
+        feedback_data_weekly = overall_feedback(df_weekly_feedback, 'Weekly Overall Feedback')
 
         # Merge the weekly feedback DataFrame with additional feedback data based on 'Team Member'
         df_weekly_feedback = pd.merge(df_weekly_feedback, feedback_data_weekly, on=['Team Member'],
@@ -367,6 +425,9 @@ def create_summary(df_copy, file_path):
             df_weekly_feedback.to_excel(writer, sheet_name='Weekly Summary', index=False)
             # Write the overall summary DataFrame to the fourth sheet
             df_summary_total.to_excel(writer, sheet_name='Overall Summary', index=False)
+            # Write the idle gaps inside the shifts and the overlapping clockings to the last sheets
+            df_idle_gaps.to_excel(writer, sheet_name='Idle Gaps', index=False)
+            df_overlaps.to_excel(writer, sheet_name='Overlapping Clockings', index=False)
 
         print(f"Summary file created at {file_path}")
     except Exception as e:
@@ -376,7 +437,15 @@ def create_summary(df_copy, file_path):
 def generate_mean_chart(df_copy):
     try:
         df_copy_1 = extract_idle_data(df_copy)
+    except Exception as e:
+        print(e)
+        return
+    plot_mean_idle_chart(df_copy_1)
 
+
+def plot_mean_idle_chart(df_copy_1):
+    # Plot the mean idle time of each Team Member from the extract_idle_data output (df_copy_1 is not modified)
+    try:
         earliest_date = df_copy_1['Stopped On Date'].min()
         latest_date = df_copy_1['Started On Date'].max()
         # Create a new dataframe to calculate the mean
@@ -2,16 +2,24 @@ import pandas as pd
 import plotly.express as px
 from tkinter import filedialog, messagebox
 
+# Columns of the Job Cost 'Operations' sheet used by the item efficiency reports, only these are read
+REQUIRED_COLUMNS = [
+    'Actual Total Hours', 'Estimated Total Hours',
+    'Estimated Make Quantity', 'Job', 'Make Item',
+    'Make Item Description'
+]
+# Types of the numeric columns, set while the sheet is read
+REQUIRED_COLUMN_DTYPES = {'Actual Total Hours': 'float64', 'Estimated Total Hours': 'float64',
+                          'Estimated Make Quantity': 'float64'}
+# Sheets read by the item efficiency buttons, see workbook_loader.read_sheets
+ITEM_EFFICIENCY_SHEETS = {'Operations': (REQUIRED_COLUMNS, REQUIRED_COLUMN_DTYPES)}
+
 def item_extract_efficiency(df):
     # Debug: Print the columns to check if all required columns are present
     print("DataFrame columns:", df.columns)
 
     # Check if all required columns are in the DataFrame
-    required_columns = [
-        'Actual Total Hours', 'Estimated Total Hours',
-        'Estimated Make Quantity', 'Job', 'Make Item',
-        'Make Item Description'
-    ]
+    required_columns = REQUIRED_COLUMNS
     missing_columns = [col for col in required_columns if col not in df.columns]
 
     if missing_columns:
@@ -74,7 +82,15 @@ def item_extract_efficiency(df):
 def item_graph_efficiency(df):
     try:
       df_item = item_extract_efficiency(df)
+    except Exception as e:
+        print(e)
+        return
+    plot_item_efficiency(df_item)
+
 
+def plot_item_efficiency(df_item):
+    # Plot the item_extract_efficiency output (df_item is not modified)
+    try:
       fig = px.bar(df_item,
                    x='Make Item',
                    y='Mean Efficiency',
@@ -92,6 +108,15 @@ def item_graph_efficiency(df):
 def save_to_csv(df_item, file_path):
     try:
         df_copy_1 = item_extract_efficiency(df_item)
+    except Exception as e:
+        print(e)
+        return
+    write_item_efficiency(df_copy_1, file_path)
+
+
+def write_item_efficiency(df_copy_1, file_path):
+    # Write the item_extract_efficiency output to the summary workbook (df_copy_1 is not modified)
+    try:
         print(df_copy_1)
 
         with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
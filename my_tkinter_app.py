@@ -1,11 +1,14 @@
 import tkinter as tk
-import pandas as pd
 from tkinter import filedialog, messagebox
 # from main import generate_gantt_chart, save_csv, extract_data_from_api
-from op_efficiency import process_data_em, plot_employee_efficiency, process_data_op, plot_operation_efficiency
-from gantt_chart import process_df,  generate_gantt_chart
-from idle_time_report import create_summary, generate_mean_chart
-from item_efficiency import item_graph_efficiency, save_to_csv
+from op_efficiency import plot_employee_efficiency, plot_operation_efficiency
+from gantt_chart import process_df, generate_gantt_chart, start_api_pull, GANTT_JOBS_PER_PAGE, GANTT_SHEETS
+from stage_timer import StageTimer
+from idle_time_report import write_idle_summary, plot_mean_idle_chart
+from item_efficiency import plot_item_efficiency, write_item_efficiency
+from analysis_session import AnalysisSession
+from report_runner import ReportRunner
+from workbook_cache import WorkbookCache
 
 
 class MyApp:
@@ -13,10 +16,19 @@ class MyApp:
         self.root = root
         self.root.title("Meiban Jobs Data")
 
+        # Sheets parsed from a workbook are kept on disk, opening the same export again skips the parsing
+        self.workbook_cache = WorkbookCache()
+        # Sheets and report frames of the files opened in this run, each computed once for all the buttons
+        self.session = AnalysisSession(self.workbook_cache)
+
         # Gantt Chart
         self.gantt_button = tk.Button(root, text="Generate Gantt Chart", command=self.upload_gantt_file)
         self.gantt_button.pack(pady=1)
 
+        # The Gantt chart is drawn GANTT_JOBS_PER_PAGE jobs at a time, this button draws the next page
+        self.gantt_page_button = tk.Button(root, text="Next Gantt Chart Page", command=self.next_gantt_page)
+        self.gantt_page_button.pack(pady=1)
+
         self.guideline_label = tk.Label(root, text="Please upload the Latest Job Activity File", bg="#0062A8",
                                         fg="#cfcfcf")
         self.guideline_label.pack(pady=5)
@@ -85,13 +97,30 @@ class MyApp:
 
         self.loading_screen = None
 
+        # Reports run on a worker thread one after the other, poll_reports shows their progress
+        self.runner = ReportRunner()
+        self.current_report = None
+        self.root.after(100, self.poll_reports)
+
+        # Last Gantt chart drawn, as (processed frame, page, number of pages), for the next page button
+        self.gantt_view = None
+
+        # Background API pull of the Gantt chart, as (Future, StageTimer) (see start_api_pull), at most one runs at
+        # a time
+        self.api_pull = None
+
     def show_loading_screen(self):
         if not hasattr(self, 'loading_screen') or self.loading_screen is None:
             self.loading_screen = tk.Toplevel(self.root)
             self.loading_screen.title("Loading...")
-            self.loading_screen.geometry("200x100")
-            label = tk.Label(self.loading_screen, text="Processing, please wait...", padx=20, pady=20)
-            label.pack()
+            self.loading_screen.geometry("320x130")
+            self.loading_label = tk.Label(self.loading_screen, text="Processing, please wait...", padx=20, pady=20)
+            self.loading_label.pack()
+            # Stops the running report at its next stage, the reports waiting after it still run
+            cancel_button = tk.Button(self.loading_screen, text="Cancel", command=self.cancel_report)
+            cancel_button.pack()
+            # Closing this window cancels every report, the running one and the ones waiting
+            self.loading_screen.protocol("WM_DELETE_WINDOW", self.runner.cancel_all)
             self.root.update_idletasks()
 
     def hide_loading_screen(self):
@@ -100,6 +129,36 @@ class MyApp:
             self.loading_screen = None
             print("Loading screen hidden.")
 
+    def run_report(self, name, function, *args):
+        # Queue a report on the worker thread, see ReportRunner; the window keeps responding while it runs
+        # function(job, *args) must not open dialogs or message boxes, Tk only allows them on the main thread
+        self.runner.submit(name, function, *args)
+        self.show_loading_screen()
+
+    def cancel_report(self):
+        if self.current_report is not None:
+            self.current_report.cancel()
+            self.loading_label.config(text=f"{self.current_report.name}: cancelling...")
+
+    def poll_reports(self):
+        # Show the progress and the errors of the reports, every 100 ms
+        for kind, job, detail in self.runner.poll():
+            if kind == 'started':
+                self.current_report = job
+            elif kind == 'stage' and self.loading_screen and not job.cancelled.is_set():
+                waiting = self.runner.pending() - 1
+                self.loading_label.config(text=f"{job.name}: {detail}..." +
+                                               (f"\n{waiting} more report(s) waiting" if waiting > 0 else ""))
+            elif kind == 'failed':
+                messagebox.showinfo("Error", f"An error occurred: {str(detail)}")
+            elif kind == 'cancelled':
+                print(f"{job.name} cancelled")
+            if kind in ('done', 'failed', 'cancelled'):
+                self.current_report = None
+                if self.runner.pending() == 0:
+                    self.hide_loading_screen()
+        self.root.after(100, self.poll_reports)
+
     def upload_efficiency_file(self):
         try:
             file_path = filedialog.askopenfilename(
@@ -107,76 +166,117 @@ class MyApp:
             )
 
             if file_path:
-                # Read and process the Excel file
-                df_em = pd.read_excel(file_path, sheet_name='Operator Time')
-                df_op = pd.read_excel(file_path, sheet_name='Operations')
-
-                # Process and plot data
-                if df_em is not None:
-                    df_em_processed = process_data_em(df_em)
-                    plot_employee_efficiency(df_em_processed)
-
-                if df_op is not None:
-                    df_op_processed = process_data_op(df_op)
-                    plot_operation_efficiency(df_op_processed)
+                self.run_report("Operation & Operator Efficiency", self.efficiency_report, file_path)
 
         except Exception as e:
             messagebox.showinfo("Error", f"An error occurred: {str(e)}")
 
+    def efficiency_report(self, job, file_path):
+        # Process and plot data (both sheets are read in one pass over the workbook)
+        job.stage('Operator efficiency')
+        df_em = self.session.employee_efficiency(file_path)
+        job.stage('Operation efficiency')
+        df_op = self.session.operation_efficiency(file_path)
+        job.stage('Draw charts')
+        plot_employee_efficiency(df_em)
+        plot_operation_efficiency(df_op)
+
     def upload_gantt_file(self):
         try:
-            file_path = filedialog.askopenfilename(
-                filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
-            )
+            # Start pulling the API data right away, it runs while the file is picked and read
+            # A pull still running (e.g. the file dialog was cancelled) is used again instead of starting another
+            # one, so cancelling the dialog and pressing the button again does not repeat every API call
+            # The pull keeps the StageTimer it was started with, so its 'API pull (background)' stage is in the
+            # timings printed for the chart
+            if self.api_pull is None or self.api_pull[0].done():
+                timer = StageTimer()
+                self.api_pull = (start_api_pull(timer), timer)
+            df_api, timer = self.api_pull
+
+            with timer.stage('Pick file'):
+                file_path = filedialog.askopenfilename(
+                    filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+                )
 
             if file_path:
-                # Read and process the Excel file
-                df_job = pd.read_excel(file_path, sheet_name='Latest Job Activity')
-                df_op = pd.read_excel(file_path, sheet_name='Open Operations')
-
-                # Process and plot data
-                if df_job is not None and df_op is not None:
-                    df_processed = process_df(df_job,df_op)
-                    generate_gantt_chart(df_processed)
+                self.run_report("Gantt Chart", self.gantt_report, file_path, df_api, timer)
 
         except Exception as e:
             messagebox.showinfo("Error", f"An error occurred: {str(e)}")
 
+    def gantt_report(self, job, file_path, df_api, timer):
+        # Read both sheets in one pass over the workbook, only the columns process_df uses
+        job.stage('Read Excel')
+        with timer.stage('Read Excel'):
+            sheets = self.session.sheets(file_path, GANTT_SHEETS)
+            df_job = sheets['Latest Job Activity']
+            df_op = sheets['Open Operations']
+
+        # Process and plot data (waits for the API data pulled in the background)
+        job.stage('Process data')
+        df_processed = process_df(df_job, df_op, df_api, timer)
+        job.stage('Draw chart')
+        with timer.stage('Draw chart'):
+            self.draw_gantt_page(df_processed, 0)
+        print(timer.report())
+
+    def draw_gantt_page(self, df_processed, page):
+        # Draw one page of the jobs, the most urgent first, and keep the frame for the next page button
+        page_count = generate_gantt_chart(df_processed, jobs_per_page=GANTT_JOBS_PER_PAGE, page=page)
+        self.gantt_view = (df_processed, page, page_count)
+
+    def next_gantt_page(self):
+        # The page after the last one is the first one again
+        if self.gantt_view is None:
+            messagebox.showinfo("Gantt Chart", "Please generate the Gantt Chart first")
+            return
+        df_processed, page, page_count = self.gantt_view
+        self.run_report("Gantt Chart", self.gantt_page_report, df_processed, (page + 1) % page_count)
+
+    def gantt_page_report(self, job, df_processed, page):
+        job.stage('Draw chart')
+        self.draw_gantt_page(df_processed, page)
+
     def upload_item_efficiency_graph_file(self):
         try:
             file_path = filedialog.askopenfilename(
                 filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
             )
             if file_path:
-                # Read and process the Excel file
-                df_item = pd.read_excel(file_path, sheet_name='Operations')
-
-                if df_item is not None:
-                    df_item_processed = item_graph_efficiency(df_item)
-                    item_graph_efficiency(df_item_processed)
+                self.run_report("Item Efficiency Chart", self.item_efficiency_chart_report, file_path)
 
         except Exception as e:
             print(f"An error occurred: {str(e)}")
 
+    def item_efficiency_chart_report(self, job, file_path):
+        # Read and process the Excel file (once per file, shared with the item efficiency summary)
+        job.stage('Item efficiency')
+        df_item = self.session.item_efficiency(file_path)
+        job.stage('Draw chart')
+        plot_item_efficiency(df_item)
+
     def save_item_efficiency_csv(self):
         try:
             file_path = filedialog.askopenfilename(
                 filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")])
 
             if file_path:
-                # Read and process the Excel file
-                df = pd.read_excel(file_path, sheet_name='Operations')
-
-                # Process and plot data
-                if df is not None:
-                    excel_file_path = filedialog.asksaveasfilename(defaultextension=".xlsx",
-                                                                   filetypes=[("Excel files", "*.xlsx")])
-                    df_processed = save_to_csv(df, excel_file_path)
-                    save_to_csv(df_processed, excel_file_path)
+                # The dialogs run here on the main thread, before the report is queued
+                excel_file_path = filedialog.asksaveasfilename(defaultextension=".xlsx",
+                                                               filetypes=[("Excel files", "*.xlsx")])
+                self.run_report("Item Efficiency Summary", self.item_efficiency_summary_report, file_path,
+                                excel_file_path)
 
         except Exception as e:
             messagebox.showinfo("Error", f"An error occurred: {str(e)}")
 
+    def item_efficiency_summary_report(self, job, file_path, excel_file_path):
+        # Read and process the Excel file (once per file, shared with the item efficiency chart)
+        job.stage('Item efficiency')
+        df_item = self.session.item_efficiency(file_path)
+        job.stage('Write summary')
+        write_item_efficiency(df_item, excel_file_path)
+
     def upload_idle_file_meanChart(self):
         try:
             file_path = filedialog.askopenfilename(
@@ -184,36 +284,41 @@ class MyApp:
             )
 
             if file_path:
-                # Read and process the Excel file
-                df = pd.read_excel(file_path)
-
-                # Process and plot data
-                if df is not None:
-                    df_processed = generate_mean_chart(df)
-                    generate_mean_chart(df_processed)
+                self.run_report("Mean Idle Time Chart", self.idle_chart_report, file_path)
 
         except Exception as e:
             messagebox.showinfo("Error", f"An error occurred: {str(e)}")
 
+    def idle_chart_report(self, job, file_path):
+        # Stream the Excel file in chunks (Time Management exports can be very large) into the idle
+        # data, computed once per file and shared with the idle summary
+        job.stage('Idle data')
+        df_idle = self.session.idle_data(file_path)
+        job.stage('Draw chart')
+        plot_mean_idle_chart(df_idle)
+
     def upload_idle_file_summary(self):
         try:
             file_path = filedialog.askopenfilename(
                 filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")])
 
             if file_path:
-                # Read and process the Excel file
-                df = pd.read_excel(file_path)
-
-                # Process and plot data
-                if df is not None:
-                    excel_file_path = filedialog.asksaveasfilename(defaultextension=".xlsx",
-                                                                   filetypes=[("Excel files", "*.xlsx")])
-                    df_processed = create_summary(df, excel_file_path)
-                    create_summary(df_processed, excel_file_path)
+                # The dialogs run here on the main thread, before the report is queued
+                excel_file_path = filedialog.asksaveasfilename(defaultextension=".xlsx",
+                                                               filetypes=[("Excel files", "*.xlsx")])
+                self.run_report("Idle Time Summary", self.idle_summary_report, file_path, excel_file_path)
 
         except Exception as e:
             messagebox.showinfo("Error", f"An error occurred: {str(e)}")
 
+    def idle_summary_report(self, job, file_path, excel_file_path):
+        # Stream the Excel file in chunks (Time Management exports can be very large) into the idle
+        # data, computed once per file and shared with the mean idle chart
+        job.stage('Idle data')
+        df_idle = self.session.idle_data(file_path)
+        job.stage('Write summary')
+        write_idle_summary(df_idle, excel_file_path)
+
     #def save_csv_file(self):
     #    csv_file_path = filedialog.asksaveasfilename(defaultextension=".csv",
     #                                                 filetypes=[("CSV files", "*.csv")])
@@ -5,8 +5,8 @@ a = Analysis(
     ['my_tkinter_app.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=['plotly'],
+    datas=[('assets/logo_grey_full.png', 'assets')],
+    hiddenimports=['plotly', 'python_calamine'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -2,6 +2,34 @@ from tkinter import filedialog
 import pandas as pd
 import plotly.express as px
 
+# Columns of the Job Costs 'Operator Time' sheet used by the employee efficiency chart, and their order
+DESIRED_DATA_EM = [
+    'Job',
+    'Item',
+    'Description',
+    'Employee',
+    'Operation',
+    'Planned Hours',
+    'Total Clocked Hours'
+]
+# Columns of the Job Costs 'Operations' sheet used by the operation efficiency chart, and their order
+DESIRED_DATA_OP = [
+    'Job',
+    'Make Item',
+    'Operation',
+    'Estimated Total Hours',
+    'Actual Total Hours',
+    'Total Hours Variance',
+    'Job Completed On'
+]
+# Sheets read by the efficiency button: only the columns above, with the numeric ones typed while reading
+# (see workbook_loader.read_sheets)
+EFFICIENCY_SHEETS = {
+    'Operator Time': (DESIRED_DATA_EM, {'Planned Hours': 'float64', 'Total Clocked Hours': 'float64'}),
+    'Operations': (DESIRED_DATA_OP, {'Estimated Total Hours': 'float64', 'Actual Total Hours': 'float64',
+                                     'Total Hours Variance': 'float64'}),
+}
+
 
 def read_excel_file(sheet_name):
     file_path = filedialog.askopenfilename(
@@ -17,15 +45,7 @@ def process_data_em(df_em):
     print("Columns in df_em:", df_em.columns)  # Debugging line
 
     # Define the desired column and their order for the DataFrame
-    desired_data_em = [
-        'Job',
-        'Item',
-        'Description',
-        'Employee',
-        'Operation',
-        'Planned Hours',
-        'Total Clocked Hours'
-    ]
+    desired_data_em = DESIRED_DATA_EM
 
     # Check if required columns exist
     missing_columns = [col for col in desired_data_em if col not in df_em.columns]
@@ -113,15 +133,7 @@ def plot_employee_efficiency(df_em):
 
 def process_data_op(df_op):
     # Define the desired column and their order for the DataFrame
-    desired_data_op = [
-        'Job',
-        'Make Item',
-        'Operation',
-        'Estimated Total Hours',
-        'Actual Total Hours',
-        'Total Hours Variance',
-        'Job Completed On'
-    ]
+    desired_data_op = DESIRED_DATA_OP
 
     # Select only the columns specified in 'desired_data_op'
     df_op = df_op[desired_data_op]
@@ -0,0 +1,96 @@
+import queue  # Thread-safe queues between the Tk main thread and the worker
+import threading
+
+
+class ReportCancelled(Exception):
+    # Raised by ReportJob.stage when the report was cancelled, the worker then moves on to the next report
+    pass
+
+
+class ReportJob:
+    # One report queued on a ReportRunner
+    # function(job, *args) runs on the worker thread and calls job.stage(name) before each stage: the stage is
+    # shown in the window and the report stops there when it was cancelled
+
+    def __init__(self, runner, name, function, args):
+        self.runner = runner
+        self.name = name
+        self.function = function
+        self.args = args
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        # Takes effect at the next stage; a report still waiting in the queue is not started at all
+        self.cancelled.set()
+
+    def stage(self, name):
+        if self.cancelled.is_set():
+            raise ReportCancelled(self.name)
+        self.runner.events.put(('stage', self, name))
+
+
+class ReportRunner:
+    # Runs the report pipelines one after the other on a worker thread, so the window keeps responding
+    # Reports submitted while one runs wait in the queue; progress, results and errors go back to the main thread
+    # through the events queue, which poll() empties (call it from root.after)
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.events = queue.Queue()
+        self.current = None
+        self.waiting = 0
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self.work, name='ReportRunner', daemon=True)
+        self.worker.start()
+
+    def submit(self, name, function, *args):
+        job = ReportJob(self, name, function, args)
+        with self.lock:
+            self.waiting += 1
+        self.jobs.put(job)
+        self.events.put(('queued', job, None))
+        return job
+
+    def cancel_all(self):
+        # Cancel the running report and every report waiting in the queue
+        with self.lock:
+            jobs = list(self.jobs.queue) + ([self.current] if self.current else [])
+        for job in jobs:
+            job.cancel()
+
+    def pending(self):
+        # Number of reports running or waiting
+        with self.lock:
+            return self.waiting
+
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            with self.lock:
+                self.current = job
+            try:
+                if job.cancelled.is_set():
+                    raise ReportCancelled(job.name)
+                self.events.put(('started', job, None))
+                event = ('done', job, job.function(job, *job.args))
+            except ReportCancelled:
+                event = ('cancelled', job, None)
+            except Exception as e:
+                event = ('failed', job, e)
+            # The report leaves pending() before its last event is posted, so the main thread sees the queue empty
+            # once it handled the last report
+            with self.lock:
+                self.current = None
+                self.waiting -= 1
+            self.events.put(event)
+
+    def poll(self):
+        # Return the events posted since the last call, as (kind, job, detail) tuples:
+        # 'queued', 'started', 'stage' (detail: stage name), 'done' (detail: result), 'failed' (detail: exception)
+        # and 'cancelled'
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
@@ -0,0 +1,181 @@
+import asyncio  # Used to wait between attempts without blocking the other API calls
+import bisect  # Used to find the histogram bucket of a latency
+import collections  # Used to queue the calls waiting for a free slot
+import random  # Used to add jitter to the backoff
+import time  # Used to measure latency and pace the token bucket
+from email.utils import parsedate_to_datetime  # Used to read Retry-After when it is a date
+
+# Status codes worth trying again: throttled (429) and transient server errors (5xx)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Status codes that mean the API is overloaded, so the concurrency is reduced
+THROTTLE_STATUSES = {429, 503}
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE = 0.5  # Seconds before the first retry (before jitter)
+DEFAULT_BACKOFF_CAP = 30  # Longest wait between two attempts, in seconds
+
+# Upper bounds (in milliseconds) of the latency histogram buckets, the last bucket holds everything slower
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class TokenBucket:
+    # Allows on average `rate` calls per second, with bursts of up to `capacity` calls
+    # Each call reserves its send time up front and sleeps once, so thousands of queued calls stay cheap
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        # Send time of the next call if the bucket were empty, the bucket is full while it is in the past
+        self.next_send = 0
+        # Nothing is sent before this time, used when the API asks us to back off (Retry-After)
+        self.paused_until = 0
+
+    async def acquire(self):
+        now = time.monotonic()
+        send_at = max(now, self.paused_until, self.next_send - (self.capacity - 1) / self.rate)
+        self.next_send = max(self.next_send, send_at) + 1 / self.rate
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrency:
+    # AIMD concurrency limit: +1 slot for every `limit` successful calls, halved when the API throttles us
+    # Waiting calls are queued first in, first out and only the ones that fit are woken up
+
+    def __init__(self, initial, maximum, minimum=1, decrease_interval=1.0):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.minimum = minimum
+        # A burst of throttled calls from the same moment only halves the limit once
+        self.decrease_interval = decrease_interval
+        self.last_decrease = 0
+        self.in_flight = 0
+        self.waiters = collections.deque()
+
+    async def acquire(self):
+        if self.in_flight < int(self.limit) and not self.waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation, give it back
+                self.in_flight -= 1
+                self.wake_waiters()
+            else:
+                self.waiters.remove(waiter)
+            raise
+
+    def release(self, throttled):
+        self.in_flight -= 1
+        now = time.monotonic()
+        if throttled:
+            if now - self.last_decrease >= self.decrease_interval:
+                self.limit = max(self.minimum, self.limit / 2)
+                self.last_decrease = now
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        self.wake_waiters()
+
+    def wake_waiters(self):
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class RequestStats:
+    # Latency histogram, call count and retry count for every endpoint
+
+    def __init__(self):
+        self.histograms = {}
+        self.total_ms = {}
+        self.retries = {}
+
+    def record(self, endpoint, latency_ms):
+        histogram = self.histograms.setdefault(endpoint, [0] * (len(LATENCY_BUCKETS_MS) + 1))
+        histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.total_ms[endpoint] = self.total_ms.get(endpoint, 0) + latency_ms
+
+    def record_retry(self, endpoint):
+        self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+    def report(self):
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        lines = []
+        for endpoint, histogram in self.histograms.items():
+            calls = sum(histogram)
+            buckets = ', '.join(f"{label}: {count}" for label, count in zip(labels, histogram) if count)
+            lines.append(f"{endpoint}: {calls} calls, {self.retries.get(endpoint, 0)} retries, "
+                         f"mean {self.total_ms[endpoint] / calls:.0f} ms ({buckets})")
+        return '\n'.join(lines)
+
+
+def retry_after_seconds(headers):
+    # Read the Retry-After header, which is either a number of seconds or an HTTP date
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    # Runs every API call through a token bucket and an AIMD concurrency limit,
+    # and retries throttled / failed calls with exponential backoff and jitter (or as long as Retry-After asks)
+
+    def __init__(self, rate_limit=None, initial_concurrency=10, max_concurrency=50,
+                 max_retries=DEFAULT_MAX_RETRIES, retry_exceptions=(ConnectionError, asyncio.TimeoutError)):
+        # rate_limit=None sends calls as fast as the concurrency limit allows
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.concurrency = AdaptiveConcurrency(min(initial_concurrency, max_concurrency), max_concurrency)
+        self.max_retries = max_retries
+        self.retry_exceptions = retry_exceptions
+        self.stats = RequestStats()
+
+    async def run(self, endpoint, send):
+        # send() makes one attempt and returns (status_code, headers, data)
+        for attempt in range(self.max_retries + 1):
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            await self.concurrency.acquire()
+
+            start = time.perf_counter()
+            status_code, headers, data, error = None, None, None, None
+            try:
+                status_code, headers, data = await send()
+            except self.retry_exceptions as e:
+                error = e
+            finally:
+                self.stats.record(endpoint, (time.perf_counter() - start) * 1000)
+                self.concurrency.release(status_code in THROTTLE_STATUSES)
+
+            if error is None and status_code not in RETRY_STATUSES:
+                return status_code, headers, data
+            if attempt == self.max_retries:
+                if error is not None:
+                    raise error
+                return status_code, headers, data
+
+            self.stats.record_retry(endpoint)
+            delay = retry_after_seconds(headers)
+            if delay is not None and self.bucket is not None:
+                # The API told us how long to wait, hold back every call, not only this one
+                self.bucket.pause(delay)
+            if delay is None:
+                # Full jitter: a random wait between 0 and the exponential backoff
+                delay = random.uniform(0, min(DEFAULT_BACKOFF_CAP, DEFAULT_BACKOFF_BASE * 2 ** attempt))
+            await asyncio.sleep(delay)
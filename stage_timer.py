@@ -0,0 +1,36 @@
+import threading  # Stages can be timed from several threads (e.g. the API pull runs in the background)
+import time  # Used to time each stage
+from contextlib import contextmanager
+
+
+class StageTimer:
+    # Start and end of each stage of a pipeline, in seconds since the timer was created
+    # Stages that ran at the same time (on different threads) overlap in the report, so the time saved is visible
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.stages = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter() - self.origin
+        try:
+            yield
+        finally:
+            end = time.perf_counter() - self.origin
+            with self.lock:
+                self.stages.append((name, start, end))
+
+    def report(self):
+        with self.lock:
+            stages = sorted(self.stages, key=lambda stage: stage[1])
+        if not stages:
+            return "Stage timings: nothing timed"
+        lines = ["Stage timings:"]
+        for name, start, end in stages:
+            lines.append(f"  {name:<24}: {start:6.2f} s -> {end:6.2f} s ({end - start:.2f} s)")
+        wall = max(end for _, _, end in stages) - min(start for _, start, _ in stages)
+        busy = sum(end - start for _, start, end in stages)
+        lines.append(f"  Wall clock {wall:.2f} s for {busy:.2f} s of stages")
+        return '\n'.join(lines)
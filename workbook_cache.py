@@ -0,0 +1,114 @@
+import hashlib  # Used to key the cached sheets by the content of the workbook
+import importlib.util  # Used to check whether pyarrow is installed
+import os
+
+from api_cache import CACHE_DIR
+
+# Folder of the parsed sheets, next to the API cache
+DEFAULT_WORKBOOK_CACHE_DIR = os.path.join(CACHE_DIR, 'workbooks')
+
+# Size of the folder above which the least recently used sheets are deleted
+DEFAULT_MAX_BYTES = 1024 * 2 ** 20
+
+# Bump when the way sheets are parsed changes, so sheets cached by an older version are not used
+CACHE_FORMAT_VERSION = 1
+
+# The sheets are stored as uncompressed Arrow IPC (Feather v2) files, which pyarrow can memory-map
+ARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+def file_content_hash(file_path, block_size=2 ** 20):
+    # SHA-256 of the file content: a workbook saved again with other data gets another key,
+    # the same workbook copied or renamed keeps its key
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as workbook_file:
+        for block in iter(lambda: workbook_file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class WorkbookCache:
+    # Persistent cache of parsed Excel sheets, keyed by the content hash of the workbook, the sheet and how it was
+    # read (columns, dtypes), so a changed workbook is never served from an older parse
+    # Sheets are evicted least recently used first once the folder grows above max_bytes
+    # Without pyarrow the cache is disabled and every sheet is parsed from the workbook
+
+    def __init__(self, directory=DEFAULT_WORKBOOK_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = ARROW_AVAILABLE
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, content_hash, sheet, columns=None, dtypes=None, reader=None):
+        # reader names the Excel reader, frames parsed by calamine and openpyxl are kept apart
+        spec = repr((CACHE_FORMAT_VERSION, content_hash, sheet, columns,
+                     sorted((dtypes or {}).items(), key=lambda item: item[0]), reader))
+        return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.arrow")
+
+    def get(self, key):
+        # Return the cached frame, or None when this sheet was not cached (or the file cannot be read)
+        if not self.enabled:
+            return None
+        path = self.path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        from pyarrow import feather
+        try:
+            df = feather.read_table(path, memory_map=True).to_pandas()
+        except Exception as e:
+            print(f"Could not read the cached sheet {path}: {e}")
+            self.misses += 1
+            return None
+        # Mark the file as recently used for the LRU eviction
+        os.utime(path)
+        self.hits += 1
+        return df
+
+    def put(self, key, df):
+        if not self.enabled:
+            return
+        from pyarrow import feather
+        path = self.path(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            # Written to a temporary file first, so a crash never leaves a half-written sheet behind
+            feather.write_feather(df.reset_index(drop=True), temporary_path, compression='uncompressed')
+            os.replace(temporary_path, path)
+        except Exception as e:
+            # e.g. a column mixing numbers and text, which Arrow cannot store: the sheet is simply not cached
+            print(f"Could not cache the sheet: {e}")
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return
+        self.evict()
+
+    def evict(self):
+        # Delete the least recently used sheets until the folder is below max_bytes
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.arrow'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+            self.evicted += 1
+
+    def report(self):
+        if not self.enabled:
+            return "Workbook cache: disabled (pyarrow is not installed)"
+        return f"Workbook cache: {self.hits} hits, {self.misses} misses, {self.evicted} evicted"
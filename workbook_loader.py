@@ -0,0 +1,113 @@
+import itertools  # Used to cut the rows of a sheet into chunks
+
+import openpyxl  # Used to stream the rows of .xlsx sheets in chunks
+import pandas as pd
+from workbook_cache import file_content_hash
+
+# Reader of read_sheets: python-calamine (required) reads .xlsx and .xls files several times faster than openpyxl
+# Reading only some columns with openpyxl is not measurably faster than pd.read_excel, openpyxl still parses every
+# cell of the sheet, so the speed of read_sheets comes from calamine
+EXCEL_ENGINE = 'calamine'
+
+# Files iter_sheet_chunks can stream with openpyxl, other files (.xls) are parsed whole (see parse_sheets)
+OPENPYXL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Rows per chunk of iter_sheet_chunks
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def read_sheets(file_path, sheets, cache=None, content_hash=None):
+    # Open the workbook once and read several sheets from it
+    # sheets maps a sheet name (or 0 for the first sheet) to (columns, dtypes):
+    #   - columns: the columns to read (the others are skipped), None to read every column
+    #   - dtypes: {column: dtype} applied while reading, e.g. {'Planned Hours': 'float64'}
+    # A column missing from the sheet is simply not in the frame, so each report still raises its own
+    # "Missing columns" error
+    # With a WorkbookCache, sheets already parsed from a workbook with the same content are loaded from the cache
+    # and only the other sheets are parsed (content_hash: the file_content_hash of the file, when already known)
+    # Returns {sheet: DataFrame}
+    frames = {}
+    keys = {}
+    if cache is not None and cache.enabled:
+        content_hash = content_hash or file_content_hash(file_path)
+        for sheet, (columns, dtypes) in sheets.items():
+            keys[sheet] = cache.key(content_hash, sheet, columns, dtypes, EXCEL_ENGINE)
+            df = cache.get(keys[sheet])
+            if df is not None:
+                frames[sheet] = df
+
+    missing = {sheet: spec for sheet, spec in sheets.items() if sheet not in frames}
+    if missing:
+        for sheet, df in parse_sheets(file_path, missing).items():
+            if sheet in keys:
+                cache.put(keys[sheet], df)
+            frames[sheet] = df
+    return {sheet: frames[sheet] for sheet in sheets}
+
+
+def parse_sheets(file_path, sheets):
+    # Parse the sheets from the workbook (see read_sheets)
+    with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as workbook:
+        return {sheet: workbook.parse(sheet, usecols=column_filter(columns), dtype=dtypes)
+                for sheet, (columns, dtypes) in sheets.items()}
+
+
+def column_filter(columns):
+    # usecols for pd.ExcelFile.parse: a callable, so a missing column does not fail the whole read
+    if columns is None:
+        return None
+    columns = set(columns)
+    return lambda column: column in columns
+
+
+def iter_sheet_rows(workbook, sheet, columns=None):
+    # Yield the header (the kept column names), then the values of the kept columns of each non-empty row
+    # Only the cell values are read (values_only), the other columns are dropped as each row is read
+    worksheet = workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, ())
+    positions = [position for position, name in enumerate(header)
+                 if name is not None and (columns is None or name in columns)]
+    yield [header[position] for position in positions]
+
+    width = len(header)
+    for row in rows:
+        if len(row) < width:
+            row = row + (None,) * (width - len(row))
+        values = [row[position] for position in positions]
+        # Empty rows (e.g. formatted but blank rows at the end of an export) carry no data
+        if any(value is not None for value in values):
+            yield values
+
+
+def apply_dtypes(df, dtypes):
+    # Apply the dtypes of the columns the frame has
+    present = {column: dtype for column, dtype in (dtypes or {}).items() if column in df.columns}
+    return df.astype(present) if present else df
+
+
+def iter_sheet_chunks(file_path, sheet=0, columns=None, dtypes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Yield the sheet as DataFrames of at most chunk_size rows, for exports too large to hold as one frame
+    # (columns and dtypes as in read_sheets); at least one, possibly empty, chunk is yielded
+    # .xlsx files are streamed by openpyxl in read-only mode, so only one chunk of rows is in memory at a time;
+    # other files (.xls) cannot be streamed and are yielded as a single chunk
+    # The chunks are not cached by WorkbookCache, caching them would mean holding the whole sheet again
+    if not file_path.lower().endswith(OPENPYXL_EXTENSIONS):
+        yield parse_sheets(file_path, {sheet: (columns, dtypes)})[sheet]
+        return
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = iter_sheet_rows(workbook, sheet, columns)
+        header = next(rows)
+        yielded = False
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk and yielded:
+                break
+            yield apply_dtypes(pd.DataFrame(chunk, columns=header), dtypes)
+            yielded = True
+            if len(chunk) < chunk_size:
+                break
+    finally:
+        workbook.close()